@@ -6,7 +6,7 @@ application settings using Pydantic for type safety and validation.
 
 import os
 from functools import lru_cache
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -28,6 +28,55 @@ class Settings(BaseSettings):
         default="sqlite:///./timetable_dev.db",
         description="SQLite connection URL for development"
     )
+    database_read_urls: str = Field(
+        default="",
+        description="Comma separated read replica URLs for read-only traffic (empty uses the primary)"
+    )
+    read_replica_check_interval: float = Field(
+        default=30.0,
+        ge=1,
+        description="Seconds between health checks of each read replica"
+    )
+    read_replica_connect_timeout: float = Field(
+        default=3.0,
+        gt=0,
+        description="Seconds to wait when opening a connection to a read replica"
+    )
+    db_pool_size: int = Field(
+        default=10,
+        ge=1,
+        le=200,
+        description="Connections kept open in the database pool"
+    )
+    db_max_overflow: int = Field(
+        default=20,
+        ge=0,
+        description="Extra connections allowed beyond the pool size under load"
+    )
+    db_pool_timeout: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds to wait for a free pooled connection"
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        ge=-1,
+        description="Seconds after which pooled connections are replaced (-1 never)"
+    )
+    sqlite_busy_timeout: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds a SQLite connection waits on a locked database"
+    )
+    sqlite_mmap_size: int = Field(
+        default=268435456,
+        ge=0,
+        description="Bytes of the SQLite file memory-mapped for reads (0 disables)"
+    )
+    sqlite_cache_size: int = Field(
+        default=-65536,
+        description="SQLite page cache per connection (negative values are KiB)"
+    )
     
     # Security
     secret_key: str = Field(
@@ -50,6 +99,51 @@ class Settings(BaseSettings):
         le=168,
         description="JWT token expiration time (1-168 hours)"
     )
+    password_hash_workers: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Threads that run bcrypt hashing/verification off the event loop"
+    )
+    password_hash_max_queue: int = Field(
+        default=64,
+        ge=0,
+        description="Password checks allowed to wait for a worker before logins are refused"
+    )
+    login_rate_limit_per_user: int = Field(
+        default=5,
+        ge=0,
+        description="Login attempts allowed per username per window (0 disables)"
+    )
+    login_rate_limit_per_ip: int = Field(
+        default=20,
+        ge=0,
+        description="Login attempts allowed per client IP per window (0 disables)"
+    )
+    login_rate_limit_window: int = Field(
+        default=300,
+        ge=1,
+        description="Sliding window for login rate limits, in seconds"
+    )
+    login_rate_limit_store: str = Field(
+        default="memory",
+        pattern="^(memory|sqlite)$",
+        description="Where login attempts are counted: memory (per process) or sqlite (shared)"
+    )
+    login_rate_limit_sqlite_path: str = Field(
+        default="./ratelimit.db",
+        description="SQLite file for the shared login rate limit store"
+    )
+    auth_cache_ttl: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds a verified token's user is cached before re-checking (0 disables)"
+    )
+    auth_cache_max_entries: int = Field(
+        default=4096,
+        ge=1,
+        description="Maximum number of cached verified tokens"
+    )
     
     # Application
     app_name: str = Field(
@@ -75,6 +169,79 @@ class Settings(BaseSettings):
         description="Deployment environment"
     )
     
+    # Production server (gunicorn.conf.py)
+    web_workers: int = Field(
+        default=0,
+        ge=0,
+        le=128,
+        description="Worker processes for the production server (0 = one per CPU core)"
+    )
+    web_max_requests: int = Field(
+        default=1000,
+        ge=0,
+        description="Requests a worker serves before it is recycled (0 disables)"
+    )
+    web_max_requests_jitter: int = Field(
+        default=100,
+        ge=0,
+        description="Random extra requests per worker so they do not all recycle together"
+    )
+    web_graceful_timeout: int = Field(
+        default=120,
+        ge=1,
+        description="Seconds a stopping worker may spend finishing in-flight requests such as generations"
+    )
+    web_worker_timeout: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds a worker's event loop may go unresponsive before the worker is restarted"
+    )
+    forwarded_allow_ips: str = Field(
+        default="127.0.0.1,::1",
+        description="Comma separated proxy addresses trusted to set X-Forwarded-For, whose client address then keys login limits ('*' trusts any peer)"
+    )
+    
+    # Caching
+    fragment_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Size limit of the rendered HTML fragment cache (0 disables it)"
+    )
+    fragment_cache_max_entries: int = Field(
+        default=512,
+        ge=1,
+        description="Maximum number of cached HTML fragments"
+    )
+    published_version_ttl: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds a process trusts its cached published-timetable version before re-checking"
+    )
+    
+    # Calendar feeds
+    calendar_weeks: int = Field(
+        default=15,
+        ge=1,
+        le=52,
+        description="Number of weekly occurrences of each class in .ics feeds"
+    )
+    calendar_timezone: str = Field(
+        default="Africa/Lagos",
+        description="Timezone advertised to calendar apps for class times"
+    )
+    
+    # Generated artifacts
+    artifact_dir: str = Field(
+        default="./artifacts",
+        description="Directory for generated files such as pre-rendered PDFs"
+    )
+    pdf_prerender_workers: int = Field(
+        default=2,
+        ge=0,
+        le=32,
+        description="Processes used to pre-render PDFs on publish (0 disables)"
+    )
+    
     @field_validator("secret_key", "jwt_secret_key")
     @classmethod
     def validate_secret_keys(cls, v: str) -> str:
@@ -93,6 +260,11 @@ class Settings(BaseSettings):
             return self.database_url
         return self.database_url_dev
     
+    @property
+    def read_urls(self) -> List[str]:
+        """Read replica URLs, in configured order."""
+        return [url.strip() for url in self.database_read_urls.split(",") if url.strip()]
+    
     class Config:
         """Pydantic configuration."""
         env_file = ".env"
@@ -9,7 +9,7 @@ from .course import Course
 from .lecturer import Lecturer
 from .venue import Venue, VenueType
 from .timeslot import TimeSlot, DayOfWeek
-from .timetable import TimetableEntry, Timetable, TimetableStatus
+from .timetable import TimetableEntry, Timetable, TimetableStatus, TimetableArchive, TimetableSnapshot
 
 __all__ = [
     "Base",
@@ -23,4 +23,6 @@ __all__ = [
     "TimeSlot",
     "DayOfWeek",
     "TimetableEntry",
+    "TimetableArchive",
+    "TimetableSnapshot",
 ]
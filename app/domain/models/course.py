@@ -45,6 +45,7 @@ class Course(Base, TimestampMixin):
     level = Column(
         Integer,
         nullable=False,
+        index=True,
         comment="Student level (100, 200, 300, 400)"
     )
     credit_hours = Column(
@@ -57,11 +58,13 @@ class Course(Base, TimestampMixin):
         String(36),
         ForeignKey("lecturers.id"),
         nullable=True,
+        index=True,
         comment="Assigned lecturer ID"
     )
     department = Column(
         String(100),
         nullable=False,
+        index=True,
         comment="Department offering the course"
     )
     enrollment = Column(
@@ -73,6 +76,7 @@ class Course(Base, TimestampMixin):
         Integer,
         nullable=False,
         default=1,
+        index=True,
         comment="Semester (1 or 2)"
     )
     # duration and frequency removed - configured dynamically at generation time
@@ -2,7 +2,7 @@
 
 import uuid
 import enum
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Enum
+from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Enum, LargeBinary, Index, Text
 from sqlalchemy.orm import relationship
 
 from .base import Base, TimestampMixin
@@ -48,9 +48,17 @@ class Timetable(Base, TimestampMixin):
         default=False,
         comment="Whether this is the currently active timetable for the semester"
     )
+    parent_id = Column(
+        String(36),
+        ForeignKey("timetables.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Timetable this draft was cloned from"
+    )
     
     # Relationships
     entries = relationship("TimetableEntry", back_populates="timetable", cascade="all, delete-orphan")
+    archive = relationship("TimetableArchive", back_populates="timetable", uselist=False, cascade="all, delete-orphan")
+    snapshots = relationship("TimetableSnapshot", back_populates="timetable", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         return f"<Timetable(session='{self.academic_session}', sem={self.semester}, status='{self.status}')>"
@@ -60,9 +68,20 @@ class TimetableEntry(Base, TimestampMixin):
     """Timetable entry entity.
     
     Represents a scheduled class session linking course, timeslot, and venue.
+    A multi-hour session is stored as a single block: ``timeslot_id`` is the
+    starting slot and ``duration`` the number of consecutive slots it covers
+    on the same day.
     """
     
     __tablename__ = "timetable_entries"
+    __table_args__ = (
+        # Grid loads and slot/venue conflict checks within one timetable
+        Index("ix_timetable_entries_timetable_slot_venue", "timetable_id", "timeslot_id", "venue_id"),
+        # Per-course lookups within one timetable (diffs, course filters)
+        Index("ix_timetable_entries_timetable_course", "timetable_id", "course_id"),
+        # Per-venue views within one timetable
+        Index("ix_timetable_entries_timetable_venue", "timetable_id", "venue_id"),
+    )
     
     id = Column(
         String(36),
@@ -79,18 +98,33 @@ class TimetableEntry(Base, TimestampMixin):
         String(36),
         ForeignKey("courses.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
         comment="Course being taught"
     )
     timeslot_id = Column(
         String(36),
         ForeignKey("timeslots.id", ondelete="CASCADE"),
         nullable=False,
-        comment="Time slot for the class"
+        index=True,
+        comment="Starting time slot for the class block"
+    )
+    duration = Column(
+        Integer,
+        default=1,
+        nullable=False,
+        comment="Number of consecutive time slots covered by the block"
+    )
+    session_index = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Index of this session among the course's weekly sessions"
     )
     venue_id = Column(
         String(36),
         ForeignKey("venues.id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
         comment="Venue where class is held (nullable for unassigned)"
     )
     is_locked = Column(
@@ -107,4 +141,76 @@ class TimetableEntry(Base, TimestampMixin):
     venue = relationship("Venue", back_populates="timetable_entries")
     
     def __repr__(self) -> str:
-        return f"<TimetableEntry(course='{self.course_id}', venue='{self.venue_id}')>"
+        return f"<TimetableEntry(course='{self.course_id}', venue='{self.venue_id}', duration={self.duration})>"
+
+
+class TimetableArchive(Base, TimestampMixin):
+    """Compacted entries of an archived timetable.
+    
+    Archiving moves a timetable's entries out of ``timetable_entries`` into a
+    single zlib-compressed JSON payload, keeping the hot table small.
+    """
+    
+    __tablename__ = "timetable_archives"
+    
+    timetable_id = Column(
+        String(36),
+        ForeignKey("timetables.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Archived timetable"
+    )
+    entry_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of entries stored in the payload"
+    )
+    payload = Column(
+        LargeBinary,
+        nullable=False,
+        comment="zlib-compressed JSON list of denormalized entries"
+    )
+    
+    # Relationships
+    timetable = relationship("Timetable", back_populates="archive")
+    
+    def __repr__(self) -> str:
+        return f"<TimetableArchive(timetable='{self.timetable_id}', entries={self.entry_count})>"
+
+
+class TimetableSnapshot(Base, TimestampMixin):
+    """Pre-bucketed grid of a published timetable for one department/level.
+    
+    Built when a timetable is published so the student portal can render
+    grids without querying the live entry, course, venue and lecturer tables.
+    """
+    
+    __tablename__ = "timetable_snapshots"
+    
+    timetable_id = Column(
+        String(36),
+        ForeignKey("timetables.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Published timetable"
+    )
+    department = Column(
+        String(100),
+        primary_key=True,
+        comment="Department the snapshot covers"
+    )
+    level = Column(
+        Integer,
+        primary_key=True,
+        comment="Student level the snapshot covers"
+    )
+    payload = Column(
+        Text,
+        nullable=False,
+        comment="Compact JSON: time labels plus [code, venue, lecturer, day, time] rows"
+    )
+    
+    # Relationships
+    timetable = relationship("Timetable", back_populates="snapshots")
+    
+    def __repr__(self) -> str:
+        return f"<TimetableSnapshot(timetable='{self.timetable_id}', department='{self.department}', level={self.level})>"
@@ -0,0 +1,175 @@
+"""Timetable archival service.
+
+Marks superseded timetable versions as archived and compacts their entries
+into one compressed blob per timetable, with a read-through loader for
+history views.
+"""
+
+import json
+import zlib
+from collections import namedtuple
+from datetime import time
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.domain.models import (
+    DayOfWeek, TimetableEntry,
+    Timetable, TimetableStatus, TimetableArchive, TimetableSnapshot
+)
+
+# Same shape as the column tuples TimetableDiffService reads from the live table
+ArchivedRow = namedtuple(
+    "ArchivedRow",
+    "timetable_id course_id session_index timeslot_id venue_id duration code department level"
+)
+
+
+class ArchiveService:
+    """Service for archiving and reading back old timetable versions."""
+
+    @staticmethod
+    def find_superseded(db: Session) -> List[Timetable]:
+        """
+        Find timetables replaced by the active published timetable of their
+        (session, semester): published versions that are no longer active,
+        and drafts created before the active version was.
+        """
+        active = db.query(Timetable).filter(
+            Timetable.status == TimetableStatus.PUBLISHED,
+            Timetable.is_active == True
+        ).all()
+        active_by_term = {(t.academic_session, t.semester): t for t in active}
+
+        superseded = []
+        candidates = db.query(Timetable).filter(Timetable.status != TimetableStatus.ARCHIVED).all()
+        for t in candidates:
+            current = active_by_term.get((t.academic_session, t.semester))
+            if not current or current.id == t.id:
+                continue
+            if t.status == TimetableStatus.PUBLISHED or t.created_at < current.created_at:
+                superseded.append(t)
+        return superseded
+
+    @staticmethod
+    def archive_superseded(db: Session) -> int:
+        """Archive every superseded timetable. Returns how many were archived."""
+        superseded = ArchiveService.find_superseded(db)
+        for timetable in superseded:
+            ArchiveService.archive_timetable(db, timetable)
+        return len(superseded)
+
+    @staticmethod
+    def archive_timetable(db: Session, timetable: Timetable) -> None:
+        """Compact a timetable's entries into its archive blob and drop them from the hot table."""
+        from app.domain.services.timetable_service import TimetableService
+        entries = TimetableService.query_grid_entries(db, timetable.id)
+
+        # Store the hours each block covers so history does not depend on
+        # the current timeslot table
+        placements, _ = TimetableService._place_entries(db, entries)
+        hours = {}
+        for entry, day, start, end in placements:
+            hours.setdefault(entry.id, []).append([day.value, start.strftime("%H:%M"), end.strftime("%H:%M")])
+
+        records = []
+        for e in entries:
+            records.append({
+                "id": e.id,
+                "course_id": e.course_id,
+                "timeslot_id": e.timeslot_id,
+                "venue_id": e.venue_id,
+                "duration": e.duration,
+                "session_index": e.session_index,
+                "is_locked": e.is_locked,
+                "code": e.course_code,
+                "title": e.course_title,
+                "department": e.department,
+                "level": e.level,
+                "lecturer_id": e.lecturer_id,
+                "lecturer": e.lecturer_name,
+                "venue": e.venue_name,
+                "hours": hours.get(e.id, []),
+            })
+
+        payload = zlib.compress(json.dumps(records, separators=(",", ":")).encode("utf-8"), 9)
+        if timetable.archive:
+            timetable.archive.payload = payload
+            timetable.archive.entry_count = len(records)
+        else:
+            db.add(TimetableArchive(timetable_id=timetable.id, payload=payload, entry_count=len(records)))
+
+        db.query(TimetableEntry).filter(
+            TimetableEntry.timetable_id == timetable.id
+        ).delete(synchronize_session=False)
+        db.query(TimetableSnapshot).filter(
+            TimetableSnapshot.timetable_id == timetable.id
+        ).delete(synchronize_session=False)
+
+        timetable.status = TimetableStatus.ARCHIVED
+        timetable.is_active = False
+        db.commit()
+
+    @staticmethod
+    def load_records(db: Session, timetable_id: str) -> list:
+        """Read back the raw archived entry records of a timetable."""
+        archive = db.query(TimetableArchive).filter(TimetableArchive.timetable_id == timetable_id).first()
+        if not archive:
+            return []
+        return json.loads(zlib.decompress(archive.payload).decode("utf-8"))
+
+    @staticmethod
+    def load_rows(db: Session, timetable_id: str) -> List[ArchivedRow]:
+        """Archived entries as plain tuples, for version comparisons."""
+        return [
+            ArchivedRow(timetable_id, r["course_id"], r["session_index"], r["timeslot_id"],
+                        r["venue_id"], r["duration"], r["code"], r["department"], r["level"])
+            for r in ArchiveService.load_records(db, timetable_id)
+        ]
+
+    @staticmethod
+    def load_entries(db: Session, timetable_id: str, department: str = None, level: str = None, **filters):
+        """
+        Archived entries as GridEntry rows, paired with the hours each block
+        covered. Extra keyword filters match record fields (e.g. lecturer_id=...).
+        """
+        from app.domain.services.timetable_service import GridEntry
+
+        entries = []
+        for r in ArchiveService.load_records(db, timetable_id):
+            if department and department != "All" and r["department"] != department:
+                continue
+            if level and level != "All" and r["level"] != int(level):
+                continue
+            if any(r.get(field) != value for field, value in filters.items()):
+                continue
+            entry = GridEntry(
+                id=r["id"],
+                course_id=r["course_id"],
+                course_code=r["code"],
+                course_title=r["title"],
+                department=r["department"],
+                level=r["level"],
+                lecturer_id=r.get("lecturer_id"),
+                lecturer_name=r["lecturer"],
+                venue_id=r["venue_id"],
+                venue_name=r["venue"],
+                timeslot_id=r["timeslot_id"],
+                duration=r["duration"],
+                session_index=r["session_index"],
+                is_locked=r["is_locked"],
+            )
+            entries.append((entry, r["hours"]))
+        return entries
+
+    @staticmethod
+    def load_placements(db: Session, timetable_id: str, department: str = None, level: str = None, **filters):
+        """
+        Archived entries as (entry, day, start_time, end_time) placements for
+        the grid, with the same GridEntry rows live timetables produce.
+        """
+        placements = []
+        for entry, hours in ArchiveService.load_entries(db, timetable_id, department, level, **filters):
+            for day, start, end in hours:
+                placements.append((entry, DayOfWeek(day), time.fromisoformat(start), time.fromisoformat(end)))
+        return placements
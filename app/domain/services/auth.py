@@ -3,18 +3,42 @@
 Handles user authentication logic including login, logout, and token management.
 """
 
-from typing import Optional, Dict, Any, Tuple
+import time
+from typing import NamedTuple, Optional, Dict, Any, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from app.domain.models.user import User
-from app.infrastructure.security.password import verify_password
+from app.domain.models.user import User, UserRole
+from app.infrastructure.cache import LRUCache
+from app.infrastructure.security.password import verify_password, verify_password_async
+from app.infrastructure.security.ratelimit import get_login_limiter
 from app.infrastructure.security.jwt import create_access_token, verify_token
 from app.config import get_settings
 
 settings = get_settings()
 
 
+class UserPrincipal(NamedTuple):
+    """Lightweight, detached view of an authenticated user."""
+    id: str
+    username: str
+    full_name: str
+    role: UserRole
+    is_active: bool
+
+
+# Verified token -> UserPrincipal, so authenticated requests skip the JWT
+# verify and the user query. Entries never outlive their token.
+_principal_cache = LRUCache(
+    max_entries=settings.auth_cache_max_entries,
+    max_size=settings.auth_cache_max_entries,
+    sizeof=lambda principal: 1,
+    ttl=settings.auth_cache_ttl
+)
+
+
 class AuthService:
     """Service for handling authentication operations."""
     
@@ -41,6 +65,33 @@ class AuthService:
             return None
             
         return user
+    
+    @staticmethod
+    async def authenticate_user_async(db: AsyncSession, username: str, password: str,
+                                      client_ip: Optional[str] = None) -> Optional[User]:
+        """Authenticate a user, running the bcrypt check on the worker pool.
+        
+        Same as authenticate_user, but never blocks the event loop: the user
+        is loaded through the AsyncSession and hashing runs on the bcrypt pool.
+        The attempt is counted against the username and client IP login
+        limits first, so throttled attempts cost no hashing at all.
+        
+        Raises:
+            RateLimited: If the username or client IP has no attempts left
+            PasswordHasherBusy: If too many password checks are already queued
+        """
+        limiter = get_login_limiter()
+        limiter.check(username, client_ip)
+        
+        user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+        if not user:
+            return None
+        
+        if not await verify_password_async(password, user.password_hash):
+            return None
+        
+        limiter.succeeded(username)
+        return user
         
     def create_user_tokens(self, user: User) -> Tuple[str, Dict[str, Any]]:
         """Create access token for user.
@@ -66,22 +117,80 @@ class AuthService:
         return access_token, token_data
     
     @staticmethod
-    def get_current_user_from_token(token: str, db: Session) -> Optional[User]:
+    def get_current_user_from_token(token: str, db: Session) -> Optional[UserPrincipal]:
         """Retrieve user from JWT token.
         
+        Verified tokens are cached for up to `auth_cache_ttl` seconds (never
+        past their expiry), so repeat requests skip both the signature check
+        and the user query.
+        
         Args:
             token: JWT token string
             db: Database session
             
         Returns:
-            User instance if token is valid and user exists, None otherwise
+            UserPrincipal if token is valid and the user exists and is active, None otherwise
         """
-        payload = verify_token(token)
+        principal = _principal_cache.get(token)
+        if principal is not None:
+            return principal
+        
+        payload = AuthService._verified_payload(token)
         if not payload:
             return None
-            
-        user_id = payload.get("sub")
-        if not user_id:
+        
+        user = db.query(User).filter(User.id == payload["sub"]).first()
+        return AuthService._remember(token, payload, user)
+    
+    @staticmethod
+    async def get_current_user_from_token_async(token: str, db: AsyncSession) -> Optional[UserPrincipal]:
+        """Async version of get_current_user_from_token, sharing its cache."""
+        principal = _principal_cache.get(token)
+        if principal is not None:
+            return principal
+        
+        payload = AuthService._verified_payload(token)
+        if not payload:
             return None
-            
-        return db.query(User).filter(User.id == user_id).first()
+        
+        user = (await db.execute(select(User).where(User.id == payload["sub"]))).scalars().first()
+        return AuthService._remember(token, payload, user)
+    
+    @staticmethod
+    def _verified_payload(token: str) -> Optional[Dict[str, Any]]:
+        """Token payload if the signature is valid and it names a user."""
+        payload = verify_token(token)
+        if not payload or not payload.get("sub"):
+            return None
+        return payload
+    
+    @staticmethod
+    def _remember(token: str, payload: Dict[str, Any], user: Optional[User]) -> Optional[UserPrincipal]:
+        """Principal of an active user, cached for the token's remaining life."""
+        if not user or not user.is_active:
+            return None
+        
+        principal = UserPrincipal(user.id, user.username, user.full_name, user.role, user.is_active)
+        if settings.auth_cache_ttl > 0:
+            expires_in = payload.get("exp", 0) - time.time()
+            if expires_in > 0:
+                _principal_cache.set(token, principal, ttl=min(settings.auth_cache_ttl, expires_in))
+        return principal
+    
+    @staticmethod
+    def forget_token(token: Optional[str]) -> None:
+        """Drop a token from the verified-token cache (on logout)."""
+        if token:
+            _principal_cache.delete(token)
+    
+    @staticmethod
+    def invalidate_user_cache() -> None:
+        """Drop every cached principal, e.g. after a user is changed."""
+        _principal_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    """Cached principals may be stale once any user row changes."""
+    AuthService.invalidate_user_cache()
@@ -0,0 +1,129 @@
+"""iCalendar export service.
+
+Turns a published timetable's snapshots into an RFC 5545 feed with one
+weekly recurring event per class block.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.domain.models import Timetable
+from app.infrastructure.cache import LRUCache
+
+# Encoded feeds keyed by (timetable id, updated_at, department, level, course codes)
+calendar_cache = LRUCache(max_entries=256, max_size=8 * 1024 * 1024)
+
+PRODID = "-//University of Ilorin//Automated Timetable System//EN"
+
+
+def _escape(text) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)."""
+    return (
+        str(text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets (RFC 5545 3.1)."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts = []
+    while data:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(data))
+        # Never split a multi-byte UTF-8 sequence
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    return "\r\n ".join(parts)
+
+
+def _utc_stamp(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+class CalendarService:
+    """Service for building iCalendar feeds of published timetables."""
+
+    @staticmethod
+    def parse_courses(courses: str) -> tuple:
+        """Normalize a comma separated course code list into a sorted tuple."""
+        return tuple(sorted({c.strip().upper() for c in (courses or "").split(",") if c.strip()}))
+
+    @staticmethod
+    def build_ics(db: Session, timetable: Timetable, department: str = "All", level: str = "All",
+                  course_codes: Iterable[str] = ()) -> str:
+        """
+        Render a timetable (optionally narrowed to some course codes) as an
+        iCalendar document. Consecutive hours of the same class on the same
+        day become one event, repeated weekly for `calendar_weeks` weeks from
+        the week the timetable was created.
+        """
+        from app.domain.services.snapshot_service import SnapshotService
+
+        settings = get_settings()
+        data = SnapshotService.get_grid(db, timetable, department, level)
+        wanted = {c.upper() for c in course_codes}
+
+        # Each class block as (day index, start, end, entry)
+        blocks = []
+        open_blocks = {}
+        for time_key in data["times"]:
+            start, end = time_key.split("-")
+            for day_idx, day in enumerate(data["days"]):
+                for entry in data["grid"][time_key][day]:
+                    if wanted and entry.course_code.upper() not in wanted:
+                        continue
+                    key = (day_idx, entry.course_code, entry.venue_name)
+                    block = open_blocks.get(key)
+                    if block is not None and block[2] == start:
+                        block[2] = end
+                    else:
+                        block = [day_idx, start, end, entry]
+                        open_blocks[key] = block
+                        blocks.append(block)
+
+        created = timetable.created_at or datetime.utcnow()
+        week_start = created.date() - timedelta(days=created.weekday())
+        stamp = _utc_stamp(timetable.updated_at or created)
+
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(f'Timetable {timetable.academic_session} S{timetable.semester}')}",
+            f"X-WR-TIMEZONE:{settings.calendar_timezone}",
+        ]
+        for day_idx, start, end, entry in sorted(blocks, key=lambda b: (b[0], b[1], b[3].course_code)):
+            date = (week_start + timedelta(days=day_idx)).strftime("%Y%m%d")
+            start_hm, end_hm = start.replace(":", ""), end.replace(":", "")
+            description = f"Lecturer: {entry.lecturer_name or 'TBA'}\n{entry.department}, {entry.level} Level"
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{timetable.id}-{entry.course_code}-{day_idx}-{start_hm}@timetable",
+                f"DTSTAMP:{stamp}",
+                # Floating local times: class hours are wall-clock times
+                f"DTSTART:{date}T{start_hm}00",
+                f"DTEND:{date}T{end_hm}00",
+                f"RRULE:FREQ=WEEKLY;COUNT={settings.calendar_weeks}",
+                f"SUMMARY:{_escape(entry.course_code)}",
+                f"LOCATION:{_escape(entry.venue_name or 'TBA')}",
+                f"DESCRIPTION:{_escape(description)}",
+                "END:VEVENT",
+            ]
+        lines.append("END:VCALENDAR")
+        return "".join(_fold(line) + "\r\n" for line in lines)
+
@@ -0,0 +1,163 @@
+"""Timetable diff service.
+
+Compares two timetable versions and reports added, removed and moved sessions.
+"""
+
+from datetime import time
+
+from sqlalchemy.orm import Session
+
+from app.domain.models import Course, Venue, TimeSlot, DayOfWeek, TimetableEntry
+
+
+class TimetableDiffService:
+    """Service for comparing timetable versions."""
+
+    @staticmethod
+    def diff(db: Session, from_id: str, to_id: str) -> dict:
+        """
+        Compute the changes needed to turn timetable `from_id` into `to_id`.
+
+        Sessions are matched on (course, session index) with a hash join over
+        plain column tuples, so the cost is linear in the number of entries.
+
+        Returns:
+            Dict with "added", "removed" and "moved" change lists, plus
+            "affected_groups": the set of (department, level) pairs touched
+            by any change, for targeted cache invalidation.
+        """
+        rows = (
+            db.query(
+                TimetableEntry.timetable_id,
+                TimetableEntry.course_id,
+                TimetableEntry.session_index,
+                TimetableEntry.timeslot_id,
+                TimetableEntry.venue_id,
+                TimetableEntry.duration,
+                Course.code,
+                Course.department,
+                Course.level,
+            )
+            .join(Course, Course.id == TimetableEntry.course_id)
+            .filter(TimetableEntry.timetable_id.in_([from_id, to_id]))
+            .all()
+        )
+
+        # Archived versions are read through from their compacted blob
+        from app.domain.models import Timetable, TimetableStatus
+        from app.domain.services.archive_service import ArchiveService
+        archived_ids = [r.id for r in db.query(Timetable.id).filter(
+            Timetable.id.in_([from_id, to_id]),
+            Timetable.status == TimetableStatus.ARCHIVED
+        ).all()]
+        for archived_id in archived_ids:
+            rows.extend(ArchiveService.load_rows(db, archived_id))
+
+        slots = {s.id: s for s in db.query(TimeSlot).all()}
+        venue_names = dict(db.query(Venue.id, Venue.name).all())
+
+        before = TimetableDiffService._index_sessions([r for r in rows if r.timetable_id == from_id], slots)
+        after = TimetableDiffService._index_sessions([r for r in rows if r.timetable_id == to_id], slots)
+
+        def describe(row):
+            return TimetableDiffService._describe(row, slots, venue_names)
+
+        added, removed, moved = [], [], []
+        for key, new in after.items():
+            old = before.get(key)
+            if old is None:
+                added.append({"key": key, "course": new.code, "department": new.department,
+                              "level": new.level, "after": describe(new)})
+            elif (old.timeslot_id, old.venue_id, old.duration) != (new.timeslot_id, new.venue_id, new.duration):
+                moved.append({"key": key, "course": new.code, "department": new.department,
+                              "level": new.level, "before": describe(old), "after": describe(new)})
+        for key, old in before.items():
+            if key not in after:
+                removed.append({"key": key, "course": old.code, "department": old.department,
+                                "level": old.level, "before": describe(old)})
+
+        affected_groups = {(c["department"], c["level"]) for c in added + removed + moved}
+
+        def sort_key(change):
+            return change["course"], change["key"][1:]
+
+        return {
+            "added": sorted(added, key=sort_key),
+            "removed": sorted(removed, key=sort_key),
+            "moved": sorted(moved, key=sort_key),
+            "affected_groups": affected_groups,
+        }
+
+    @staticmethod
+    def changes_from_base(db: Session, timetable_id: str):
+        """
+        The version a timetable is compared against and the (department,
+        level) groups that differ from it, as (base, affected_groups).
+        Returns (None, None) when there is nothing to compare with.
+        """
+        from app.domain.models import Timetable
+
+        timetable = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+        base_id = TimetableDiffService.default_base_id(db, timetable) if timetable else None
+        base = db.query(Timetable).filter(Timetable.id == base_id).first() if base_id else None
+        if base is None:
+            return None, None
+        return base, TimetableDiffService.diff(db, base.id, timetable.id)["affected_groups"]
+
+    @staticmethod
+    def touches(groups, department: str = "All", level: str = "All") -> bool:
+        """Whether a view filtered on (department, level) shows any of `groups`."""
+        return any(
+            (department == "All" or department == group_department)
+            and (level == "All" or str(level) == str(group_level))
+            for group_department, group_level in groups
+        )
+
+    @staticmethod
+    def default_base_id(db: Session, timetable):
+        """
+        Pick the version a timetable should be compared against: its clone
+        parent, or otherwise the active published timetable of its semester.
+        """
+        from app.domain.models import Timetable, TimetableStatus
+
+        if timetable.parent_id:
+            return timetable.parent_id
+        active = db.query(Timetable.id).filter(
+            Timetable.academic_session == timetable.academic_session,
+            Timetable.semester == timetable.semester,
+            Timetable.status == TimetableStatus.PUBLISHED,
+            Timetable.is_active == True,
+            Timetable.id != timetable.id
+        ).first()
+        return active.id if active else None
+
+    @staticmethod
+    def _index_sessions(rows, slots) -> dict:
+        """
+        Key rows by (course_id, session_index, occurrence).
+        The occurrence counter keeps legacy hourly rows, which all share
+        session index 0, from colliding.
+        """
+        day_order = {d: i for i, d in enumerate(DayOfWeek)}
+
+        def slot_order(row):
+            slot = slots.get(row.timeslot_id)
+            return (day_order[slot.day], slot.start_time) if slot else (len(day_order), time.min)
+
+        index = {}
+        seen = {}
+        for row in sorted(rows, key=lambda r: (r.course_id, r.session_index or 0, slot_order(r))):
+            base = (row.course_id, row.session_index or 0)
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            index[base + (occurrence,)] = row
+        return index
+
+    @staticmethod
+    def _describe(row, slots, venue_names) -> str:
+        """Human readable placement, e.g. 'Monday 08:00 (2h) @ LT1'."""
+        slot = slots.get(row.timeslot_id)
+        when = f"{slot.day.value} {slot.start_time.strftime('%H:%M')}" if slot else "Unknown slot"
+        venue = venue_names.get(row.venue_id, "Unassigned") if row.venue_id else "Unassigned"
+        return f"{when} ({row.duration or 1}h) @ {venue}"
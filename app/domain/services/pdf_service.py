@@ -1,33 +1,44 @@
 """PDF Generation Service for Timetables.
 
 Generates print-optimized PDF exports of timetables using ReportLab.
+ReportLab is imported on first render, so importing this module (e.g. to
+schedule pre-rendering on publish) stays cheap.
 """
 
+import multiprocessing
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
 from sqlalchemy.orm import Session
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
 from app.domain.services.timetable_service import TimetableService
-from app.domain.models import Venue
+from app.domain.models import Venue, Timetable
+from app.infrastructure.storage import get_artifact_store
+from app.config import get_settings
+
+PDF_NAMESPACE = "pdf"
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+PDF_SPOOL_MAX_MEMORY = 1024 * 1024
+
+# Process pool for background pre-rendering, created on first publish
+_prerender_pool: Optional[ProcessPoolExecutor] = None
+_prerender_lock = threading.Lock()
 
 class PDFService:
     """Service for generating timetable PDFs."""
     
-    # Department color mapping (light colors for printing)
+    # Department color mapping (light colors for printing, as hex for colors.HexColor)
     DEPT_COLORS = {
-        0: colors.HexColor('#cfe2ff'),  # primary
-        1: colors.HexColor('#d1e7dd'),  # success
-        2: colors.HexColor('#cff4fc'),  # info
-        3: colors.HexColor('#fff3cd'),  # warning
-        4: colors.HexColor('#f8d7da'),  # danger
-        5: colors.HexColor('#e2e3e5'),  # dark
+        0: '#cfe2ff',  # primary
+        1: '#d1e7dd',  # success
+        2: '#cff4fc',  # info
+        3: '#fff3cd',  # warning
+        4: '#f8d7da',  # danger
+        5: '#e2e3e5',  # dark
     }
     
     @staticmethod
@@ -43,6 +54,29 @@ class PDFService:
         Returns:
             PDF file as bytes
         """
+        buffer = BytesIO()
+        PDFService.render_timetable_pdf(db, timetable_id, buffer, department, level)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def render_timetable_pdf(db: Session, timetable_id: str, out: BinaryIO,
+                             department: str = "All", level: str = "All") -> None:
+        """Render a print-optimized PDF of the timetable into a binary file object.
+        
+        Args:
+            db: Database session
+            timetable_id: ID of the timetable to export
+            out: Writable binary file (temp file, spooled buffer, ...)
+            department: Department filter
+            level: Level filter
+        """
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import cm
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.enums import TA_CENTER
+
         # Get timetable data
         data = TimetableService.get_timetable_grid(db, timetable_id, department, level)
         timetable = data.get('timetable')
@@ -54,9 +88,8 @@ class PDFService:
         venues = db.query(Venue).order_by(Venue.name).all()
         
         # Create PDF
-        buffer = BytesIO()
         doc = SimpleDocTemplate(
-            buffer,
+            out,
             pagesize=landscape(A4),
             rightMargin=1*cm,
             leftMargin=1*cm,
@@ -164,10 +197,109 @@ class PDFService:
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
-        
-        return buffer.getvalue()
     
+    @staticmethod
+    def artifact_key(timetable: Timetable, department: str = "All", level: str = "All"):
+        """Artifact store key of a timetable version's PDF for some filters."""
+        version = timetable.updated_at.isoformat() if timetable.updated_at else ""
+        return PDF_NAMESPACE, timetable.id, version, f"{department}|{level}"
+
+    @staticmethod
+    def get_or_render_pdf(db: Session, timetable: Timetable, department: str = "All", level: str = "All") -> Path:
+        """
+        Path of a stored PDF for this version/filter combination, rendering
+        it straight to disk first if it has not been generated yet.
+        """
+        store = get_artifact_store()
+        key = PDFService.artifact_key(timetable, department, level)
+        path = store.get(*key)
+        if path is not None:
+            return path
+        return store.write(*key, lambda f: PDFService.render_timetable_pdf(db, timetable.id, f, department, level))
+
+    @staticmethod
+    def open_pdf(db: Session, timetable: Timetable, department: str = "All", level: str = "All") -> BinaryIO:
+        """
+        Open the stored PDF of this version/filter combination for reading,
+        rendering it first if needed. An open file stays readable even if a
+        newer version prunes it; if it is pruned between lookup and open,
+        it is rendered again (into a spooled buffer if that races too).
+        """
+        for _ in range(2):
+            path = PDFService.get_or_render_pdf(db, timetable, department, level)
+            try:
+                return path.open("rb")
+            except FileNotFoundError:
+                continue
+        spool = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY)
+        PDFService.render_timetable_pdf(db, timetable.id, spool, department, level)
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    def stream_timetable_pdf(db: Session, timetable_id: str, department: str = "All", level: str = "All") -> Iterator[bytes]:
+        """
+        Render into a spooled temp file (kept in memory while small) and
+        return an iterator over its chunks. Rendering happens eagerly so
+        errors surface before a response is started.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY)
+        try:
+            PDFService.render_timetable_pdf(db, timetable_id, spool, department, level)
+            spool.seek(0)
+        except BaseException:
+            spool.close()
+            raise
+
+        return iter_file_chunks(spool)
+
+    @staticmethod
+    def schedule_prerender(timetable_id: str) -> bool:
+        """
+        Pre-render every (department, level) combination of a timetable in
+        the background process pool. Returns immediately; False if disabled.
+        """
+        global _prerender_pool
+        workers = get_settings().pdf_prerender_workers
+        if workers <= 0:
+            return False
+        with _prerender_lock:
+            if _prerender_pool is None:
+                # Spawn, not fork: this process already runs the event loop,
+                # thread pools and open DB pools, and forking a threaded
+                # process can deadlock the child on a lock held mid-fork
+                _prerender_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            pool = _prerender_pool
+        # Enumerating combinations needs the DB, so do it off the request path too
+        threading.Thread(target=_submit_prerender, args=(pool, timetable_id), daemon=True).start()
+        return True
+
+    @staticmethod
+    def carry_artifacts(db: Session, source_id: str, source_updated_at, target: Timetable, affected_groups) -> int:
+        """
+        Reuse the stored PDFs a change did not touch: every filter
+        combination of `target` that shows none of `affected_groups` is
+        copied from `source_id` at version `source_updated_at`. Returns the
+        number of PDFs carried over.
+        """
+        from app.domain.services.diff_service import TimetableDiffService
+
+        source_version = source_updated_at.isoformat() if source_updated_at else ""
+        namespace, _, target_version, _ = PDFService.artifact_key(target)
+        names = [
+            f"{department}|{level}"
+            for department, level in _filter_combinations(db, target.id)
+            if not TimetableDiffService.touches(affected_groups, department, level)
+        ]
+        return get_artifact_store().carry(namespace, source_id, source_version, target.id, target_version, names)
+
+    @staticmethod
+    def discard_artifacts(timetable_id: str) -> None:
+        """Remove all stored PDFs of a timetable."""
+        get_artifact_store().discard(PDF_NAMESPACE, timetable_id)
+
     @staticmethod
     def _build_table_data(data: dict) -> list:
         """Build table data for ReportLab Table.
@@ -193,10 +325,10 @@ class PDFService:
                     # Format entries as text
                     cell_lines = []
                     for entry in entries:
-                        venue_text = entry.venue.name if entry.venue else "TBA"
-                        lecturer_text = entry.course.lecturer.name if entry.course.lecturer else "TBA"
+                        venue_text = entry.venue_name or "TBA"
+                        lecturer_text = entry.lecturer_name or "TBA"
                         
-                        cell_text = f"{entry.course.code}\n{venue_text}\n{lecturer_text}"
+                        cell_text = f"{entry.course_code}\n{venue_text}\n{lecturer_text}"
                         cell_lines.append(cell_text)
                     
                     row.append("\n\n".join(cell_lines))
@@ -206,3 +338,76 @@ class PDFService:
             table_data.append(row)
         
         return table_data
+
+
+def iter_file_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Yield a binary file's content in chunks, closing it at the end."""
+    try:
+        while True:
+            chunk = f.read(PDF_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+def shutdown_prerender_pool(wait: bool = True) -> None:
+    """Stop the background pre-render pool, optionally waiting for queued work."""
+    global _prerender_pool
+    with _prerender_lock:
+        pool, _prerender_pool = _prerender_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _filter_combinations(db: Session, timetable_id: str):
+    """Every (department, level) filter pair, including "All", of a timetable."""
+    from app.domain.models import Course, TimetableEntry
+    from app.domain.services.snapshot_service import SnapshotService
+
+    keys = SnapshotService.list_keys(db, timetable_id)
+    if not keys:
+        # Drafts have no snapshots: read the groups off the entries
+        keys = db.query(Course.department, Course.level).join(
+            TimetableEntry, TimetableEntry.course_id == Course.id
+        ).filter(TimetableEntry.timetable_id == timetable_id).distinct().all()
+    keys = [(department, str(level)) for department, level in keys]
+    departments = sorted({d for d, _ in keys})
+    levels = sorted({l for _, l in keys})
+    return [("All", "All")] + [(d, "All") for d in departments] + [("All", l) for l in levels] + sorted(keys)
+
+
+def _submit_prerender(pool: ProcessPoolExecutor, timetable_id: str) -> None:
+    """Queue one render job per filter combination of a timetable."""
+    from app.infrastructure.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        combos = _filter_combinations(db, timetable_id)
+    finally:
+        db.close()
+
+    for department, level in combos:
+        try:
+            pool.submit(_prerender_one, timetable_id, department, level)
+        except RuntimeError:
+            # Pool is shutting down
+            return
+
+
+def _prerender_one(timetable_id: str, department: str, level: str) -> None:
+    """Worker: render one combination into the artifact store."""
+    from app.infrastructure.database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        timetable = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+        if timetable is None:
+            return
+        store = get_artifact_store()
+        key = PDFService.artifact_key(timetable, department, level)
+        if store.get(*key) is None:
+            store.write(*key, lambda f: PDFService.render_timetable_pdf(db, timetable.id, f, department, level))
+    finally:
+        db.close()
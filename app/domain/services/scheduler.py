@@ -124,10 +124,12 @@ class SchedulerService:
             valid_indices = []
             for i in range(len(self.timeslots) - d + 1):
                 # Check strict consecutive: same day
-                start_ts = self.timeslots[i]
-                end_ts = self.timeslots[i + d - 1]
-                if start_ts.day == end_ts.day:
-                     # Also check timestamps? Assumed consecutive by array order if seed is consistent.
+                block = self.timeslots[i:i + d]
+                same_day = block[0].day == block[-1].day
+                # Blocks are stored as start + duration, so the hours must be
+                # contiguous (e.g. not straddling the filtered Friday break)
+                contiguous = all(prev.end_time == nxt.start_time for prev, nxt in zip(block, block[1:]))
+                if same_day and contiguous:
                      valid_indices.append(i)
             valid_starts_by_duration[d] = valid_indices
 
@@ -202,24 +204,22 @@ class SchedulerService:
         return True
 
     def _save_solution(self):
-        """Persist assignment. Expand blocks into individual hourly entries."""
+        """Persist assignment. Each block is stored as a single entry."""
         new_entries = []
         for item_idx, (start_slot_idx, venue) in self.assignment.items():
             course, session_i, duration = self.items[item_idx]
             
-            # Create one entry per hour of the block
-            for offset in range(duration):
-                slot_idx = start_slot_idx + offset
-                timeslot = self.timeslots[slot_idx]
-                
-                entry = TimetableEntry(
-                    timetable_id=self.timetable_id,
-                    course_id=course.id,
-                    timeslot_id=timeslot.id,
-                    venue_id=venue.id if venue is not None else None
-                    # We could add session metadata if model supported it
-                )
-                new_entries.append(entry)
+            # One row per block: the start slot plus the number of hours it spans
+            timeslot = self.timeslots[start_slot_idx]
+            entry = TimetableEntry(
+                timetable_id=self.timetable_id,
+                course_id=course.id,
+                timeslot_id=timeslot.id,
+                venue_id=venue.id if venue is not None else None,
+                duration=duration,
+                session_index=session_i
+            )
+            new_entries.append(entry)
         
         self.db.add_all(new_entries)
         self.db.commit()
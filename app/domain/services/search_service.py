@@ -0,0 +1,138 @@
+"""Course search service.
+
+Keeps an in-memory trigram index over course code, title and lecturer name,
+so substring searches do not scan the courses table. The index is rebuilt
+whenever the course or lecturer tables change.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.models import Course, Lecturer
+
+
+class CourseHit(NamedTuple):
+    """A course matching a search query."""
+    id: str
+    code: str
+    title: str
+
+
+class _CourseIndex(NamedTuple):
+    version: tuple
+    courses: Dict[str, CourseHit]
+    texts: Dict[str, str]
+    trigrams: Dict[str, Set[str]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CourseSearchService:
+    """Service for searching courses by code, title or lecturer name."""
+
+    @staticmethod
+    def search(db: Session, query: str, limit: int = None) -> List[CourseHit]:
+        """
+        Courses whose code, title or lecturer name contains `query`
+        (case-insensitive), ordered by course code.
+        """
+        needle = _normalize(query)
+        if not needle:
+            return []
+        index = CourseSearchService._get_index(db)
+
+        if len(needle) >= 3:
+            # Candidates must contain every trigram of the query; the
+            # substring check below removes the false positives
+            grams = sorted(_trigrams(needle), key=lambda g: len(index.trigrams.get(g, ())))
+            candidates = set(index.trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                candidates &= index.trigrams.get(gram, set())
+                if not candidates:
+                    break
+        else:
+            candidates = index.texts.keys()
+
+        hits = sorted(
+            (index.courses[cid] for cid in candidates if needle in index.texts[cid]),
+            key=lambda h: h.code
+        )
+        return hits[:limit] if limit else hits
+
+    @staticmethod
+    async def search_async(db: AsyncSession, query: str, limit: int = None) -> List[CourseHit]:
+        """Async version of search; the index is only rebuilt on a version change."""
+        return await db.run_sync(CourseSearchService.search, query, limit)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop the index; it is rebuilt on the next search."""
+        global _index
+        with _index_lock:
+            _index = None
+
+    @staticmethod
+    def version(db: Session) -> tuple:
+        """
+        Cheap fingerprint of the indexed data: row counts and latest update
+        times of courses and lecturers, read in one aggregate query.
+        """
+        return tuple(db.execute(CourseSearchService._version_query()).one())
+
+    @staticmethod
+    async def version_async(db: AsyncSession) -> tuple:
+        """Async version of version."""
+        return tuple((await db.execute(CourseSearchService._version_query())).one())
+
+    @staticmethod
+    def _version_query():
+        return select(
+            select(func.count(Course.id)).scalar_subquery(),
+            select(func.max(Course.updated_at)).scalar_subquery(),
+            select(func.count(Lecturer.id)).scalar_subquery(),
+            select(func.max(Lecturer.updated_at)).scalar_subquery(),
+        )
+
+    @staticmethod
+    def _get_index(db: Session) -> _CourseIndex:
+        global _index
+        version = CourseSearchService.version(db)
+        index = _index
+        if index is None or index.version != version:
+            # Built outside the lock: on the async path the query yields to
+            # other requests, which must not be left blocking on the lock
+            index = CourseSearchService._build(db, version)
+            with _index_lock:
+                _index = index
+        return index
+
+    @staticmethod
+    def _build(db: Session, version: tuple) -> _CourseIndex:
+        rows = (
+            db.query(Course.id, Course.code, Course.title, Lecturer.name)
+            .outerjoin(Lecturer, Lecturer.id == Course.lecturer_id)
+            .all()
+        )
+        courses, texts, trigrams = {}, {}, {}
+        for course_id, code, title, lecturer_name in rows:
+            courses[course_id] = CourseHit(course_id, code, title)
+            # Fields are joined with a separator no query can span
+            text = "\n".join(_normalize(part) for part in (code, title, lecturer_name))
+            texts[course_id] = text
+            for gram in _trigrams(text):
+                trigrams.setdefault(gram, set()).add(course_id)
+        return _CourseIndex(version, courses, texts, trigrams)
@@ -0,0 +1,221 @@
+"""Published timetable snapshot service.
+
+Materializes a published timetable into pre-bucketed JSON snapshots keyed by
+(department, level), so read-heavy views never touch the live entry tables.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.domain.models import DayOfWeek, Timetable, TimetableSnapshot, TimetableStatus
+
+
+class PublishedVersion(NamedTuple):
+    """Identity of the timetable currently shown to students."""
+    timetable_id: str
+    updated_at: Optional[datetime]
+
+
+# Per-process pointer to the published version: (PublishedVersion or None,
+# monotonic time it was read). Lets feeds answer conditional GETs without a query.
+_published_version = None
+_published_version_lock = threading.Lock()
+
+
+class SnapshotService:
+    """Service for building and reading published timetable snapshots."""
+
+    @staticmethod
+    def build(db: Session, timetable: Timetable, groups=None, base_id: str = None) -> int:
+        """
+        (Re)build the snapshots of a timetable, one per (department, level).
+        With `groups`, only those (department, level) snapshots are rebuilt
+        and the rest are kept; with `base_id` too, the rest are copied from
+        that timetable's snapshots instead (when its time rows still match),
+        e.g. from the version a new publish replaces.
+        Returns the number of snapshot rows written. Does not commit.
+        """
+        from app.domain.services.timetable_service import TimetableService
+
+        entries = TimetableService.query_grid_entries(db, timetable.id)
+        if groups is not None:
+            entries = [e for e in entries if (e.department, e.level) in groups]
+        placements, all_slots = TimetableService._place_entries(db, entries)
+
+        days = list(DayOfWeek)
+        times = sorted(set((s.start_time, s.end_time) for s in all_slots))
+        time_labels = [f"{s.strftime('%H:%M')}-{e.strftime('%H:%M')}" for s, e in times]
+        time_index = {t: i for i, t in enumerate(times)}
+        day_index = {d: i for i, d in enumerate(days)}
+
+        rebuilt = {}
+        for entry, day, start, end in placements:
+            rebuilt.setdefault((entry.department, entry.level), []).append(
+                [entry.course_code, entry.venue_name, entry.lecturer_name,
+                 day_index[day], time_index[(start, end)]]
+            )
+
+        copied = []
+        if groups is not None and base_id:
+            base_rows = SnapshotService._load_groups(db, base_id)
+            if not base_rows or json.loads(base_rows[0].payload)["times"] != time_labels:
+                # No base snapshots, or the slot layout changed since: rebuild everything
+                return SnapshotService.build(db, timetable)
+            copied = [row for row in base_rows if (row.department, row.level) not in groups]
+
+        stale = db.query(TimetableSnapshot).filter(TimetableSnapshot.timetable_id == timetable.id)
+        if groups is not None and not base_id:
+            stale = stale.filter(tuple_(TimetableSnapshot.department, TimetableSnapshot.level).in_(list(groups)))
+        stale.delete(synchronize_session=False)
+
+        for department, level, payload in copied:
+            db.add(TimetableSnapshot(timetable_id=timetable.id, department=department, level=level, payload=payload))
+        for (department, level), rows in rebuilt.items():
+            rows.sort(key=lambda r: (r[4], r[3], r[0]))
+            payload = json.dumps({"times": time_labels, "rows": rows}, separators=(",", ":"))
+            db.add(TimetableSnapshot(
+                timetable_id=timetable.id,
+                department=department,
+                level=level,
+                payload=payload
+            ))
+        return len(copied) + len(rebuilt)
+
+    @staticmethod
+    def get_grid(db: Session, timetable: Timetable, department: str = None, level: str = None) -> dict:
+        """
+        Read a published timetable's grid from its snapshots.
+        Returns the same structure as TimetableService.get_timetable_grid.
+        Snapshots are built on first read if the timetable predates them.
+        """
+        from app.domain.services.timetable_service import TimetableService, GridEntry
+
+        groups = SnapshotService._load_groups(db, timetable.id, department, level)
+        if not groups and not SnapshotService.exists(db, timetable.id):
+            if db.info.get("read_only"):
+                # Replica sessions cannot write: read the live entries instead
+                return TimetableService.get_timetable_grid(db, timetable.id, department, level)
+            SnapshotService.build(db, timetable)
+            db.commit()
+            groups = SnapshotService._load_groups(db, timetable.id, department, level)
+
+        days = [d.value for d in DayOfWeek]
+        if groups:
+            times = json.loads(groups[0][2])["times"]
+        else:
+            slots = TimetableService.get_slots(db)
+            times = [
+                f"{s.strftime('%H:%M')}-{e.strftime('%H:%M')}"
+                for s, e in sorted(set((s.start_time, s.end_time) for s in slots))
+            ]
+
+        grid = {t: {d: [] for d in days} for t in times}
+        for group_department, group_level, payload in groups:
+            for code, venue, lecturer, day_idx, time_idx in json.loads(payload)["rows"]:
+                grid[times[time_idx]][days[day_idx]].append(GridEntry(
+                    id=None, course_id=None, course_code=code, course_title=None,
+                    department=group_department, level=group_level,
+                    lecturer_id=None, lecturer_name=lecturer,
+                    venue_id=None, venue_name=venue, timeslot_id=None,
+                    duration=1, session_index=0, is_locked=False
+                ))
+
+        if len(groups) > 1:
+            for row in grid.values():
+                for cell in row.values():
+                    cell.sort(key=lambda e: e.course_code)
+
+        return {"days": days, "times": times, "grid": grid, "timetable": timetable}
+
+    @staticmethod
+    def published_version(db: Session) -> Optional[PublishedVersion]:
+        """
+        The latest published timetable's (id, updated_at), re-read from the
+        database at most every `published_version_ttl` seconds. Other
+        processes' publishes become visible once the TTL expires.
+        """
+        global _published_version
+        ttl = get_settings().published_version_ttl
+        with _published_version_lock:
+            cached = _published_version
+        if cached is not None and time.monotonic() - cached[1] < ttl:
+            return cached[0]
+
+        row = db.query(Timetable.id, Timetable.updated_at).filter(
+            Timetable.status == TimetableStatus.PUBLISHED
+        ).order_by(Timetable.created_at.desc()).first()
+        version = PublishedVersion(row.id, row.updated_at) if row else None
+        with _published_version_lock:
+            _published_version = (version, time.monotonic())
+        return version
+
+    @staticmethod
+    def invalidate_published_version() -> None:
+        """Forget the cached published version (after publish or edits)."""
+        global _published_version
+        with _published_version_lock:
+            _published_version = None
+
+    @staticmethod
+    async def get_grid_async(db: AsyncSession, timetable: Timetable, department: str = None, level: str = None) -> dict:
+        """Async version of get_grid, run on the session's async driver."""
+        return await db.run_sync(SnapshotService.get_grid, timetable, department, level)
+
+    @staticmethod
+    async def latest_published_async(db: AsyncSession) -> Optional[Timetable]:
+        """The most recently created published timetable, if any."""
+        query = (
+            select(Timetable)
+            .where(Timetable.status == TimetableStatus.PUBLISHED)
+            .order_by(Timetable.created_at.desc())
+            .limit(1)
+        )
+        return (await db.execute(query)).scalars().first()
+
+    @staticmethod
+    async def get_filters_async(db: AsyncSession, timetable_id: str):
+        """Async version of get_filters."""
+        return await db.run_sync(SnapshotService.get_filters, timetable_id)
+
+    @staticmethod
+    def get_filters(db: Session, timetable_id: str):
+        """Departments and levels present in a timetable's snapshots."""
+        keys = SnapshotService.list_keys(db, timetable_id)
+        departments = sorted({k.department for k in keys})
+        levels = [str(l) for l in sorted({k.level for k in keys})]
+        return departments, levels
+
+    @staticmethod
+    def list_keys(db: Session, timetable_id: str):
+        """(department, level) pairs that have a snapshot."""
+        return db.query(TimetableSnapshot.department, TimetableSnapshot.level).filter(
+            TimetableSnapshot.timetable_id == timetable_id
+        ).all()
+
+    @staticmethod
+    def exists(db: Session, timetable_id: str) -> bool:
+        """Whether any snapshot has been built for a timetable."""
+        return db.query(TimetableSnapshot.timetable_id).filter(
+            TimetableSnapshot.timetable_id == timetable_id
+        ).first() is not None
+
+    @staticmethod
+    def _load_groups(db: Session, timetable_id: str, department: str = None, level: str = None):
+        query = db.query(
+            TimetableSnapshot.department,
+            TimetableSnapshot.level,
+            TimetableSnapshot.payload
+        ).filter(TimetableSnapshot.timetable_id == timetable_id)
+        if department and department != "All":
+            query = query.filter(TimetableSnapshot.department == department)
+        if level and level != "All":
+            query = query.filter(TimetableSnapshot.level == int(level))
+        return query.all()
@@ -1,8 +1,53 @@
 """Timetable domain service."""
 
+import threading
+from datetime import datetime, time
+from typing import NamedTuple, Optional
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from app.domain.models import Course, Lecturer, Venue, TimetableEntry
+from app.domain.models.timeslot import TimeSlot, DayOfWeek
+
+
+class GridEntry(NamedTuple):
+    """Lightweight, read-only timetable entry row used to render grids."""
+    id: str
+    course_id: str
+    course_code: str
+    course_title: str
+    department: str
+    level: int
+    lecturer_id: Optional[str]
+    lecturer_name: Optional[str]
+    venue_id: Optional[str]
+    venue_name: Optional[str]
+    timeslot_id: str
+    duration: int
+    session_index: int
+    is_locked: bool
+
+
+class SlotInfo(NamedTuple):
+    """Plain copy of a TimeSlot row, safe to share across sessions."""
+    id: str
+    day: DayOfWeek
+    start_time: time
+    end_time: time
+
+
+# Timeslots only change when the database is seeded or reset, so the layout
+# is loaded once per process and reloaded if an unknown slot id shows up.
+_slot_cache = None
+_slot_cache_lock = threading.Lock()
+
+
+def invalidate_slot_cache() -> None:
+    """Forget the cached timeslot layout."""
+    global _slot_cache
+    with _slot_cache_lock:
+        _slot_cache = None
+
 
 class TimetableService:
     """Service for timetable operations."""
@@ -55,52 +100,184 @@ class TimetableService:
         return success, timetable.id
 
     @staticmethod
-    def get_timetable_grid(db: Session, timetable_id: str = None, department: str = None, level: str = None):
-        """Retrieve timetable entries organized for the grid view."""
-        from app.domain.models import Timetable, TimetableStatus
-        
-        # If no ID provided, get latest active or latest draft
-        if not timetable_id:
-            # Try get active first
-            active = db.query(Timetable).filter(Timetable.is_active == True).order_by(Timetable.created_at.desc()).first()
-            if active:
-                timetable_id = active.id
-            else:
-                # Get latest generated
-                latest = db.query(Timetable).order_by(Timetable.created_at.desc()).first()
-                if latest:
-                    timetable_id = latest.id
-                else:
-                    # No timetables exist
-                    return {"days": [], "times": [], "grid": {}, "timetable": None}
-                    
-        timetable = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+    def get_timetable_grid(db: Session, timetable_id: str = None, department: str = None, level: str = None, **filters):
+        """
+        Retrieve timetable entries organized for the grid view.
+
+        Entries are fetched with a single projection query and returned as
+        GridEntry tuples, so rendering never triggers lazy loads. Extra
+        keyword filters (lecturer_id=..., venue_id=...) narrow the grid to
+        one resource; see query_grid_entries.
+        """
+        from app.domain.models import TimetableStatus
+
+        timetable = TimetableService.resolve_timetable(db, timetable_id)
         if not timetable:
              return {"days": [], "times": [], "grid": {}, "timetable": None}
+        timetable_id = timetable.id
 
-        # Use outerjoin for venue since venue_id can be NULL (unassigned)
+        if timetable.status == TimetableStatus.ARCHIVED:
+            # Archived entries live in the compacted archive blob
+            from app.domain.services.archive_service import ArchiveService
+            placements = ArchiveService.load_placements(db, timetable_id, department, level, **filters)
+            all_slots = TimetableService.get_slots(db)
+        else:
+            entries = TimetableService.query_grid_entries(db, timetable_id, department, level, **filters)
+            placements, all_slots = TimetableService._place_entries(db, entries)
+
+        return TimetableService._build_grid(placements, all_slots, timetable)
+
+    @staticmethod
+    def get_sessions(db: Session, timetable_id: str, **filters):
+        """
+        List a timetable's sessions as plain dicts, one per block, ordered by
+        day and start time. Takes the same filters as get_timetable_grid.
+        """
+        data = TimetableService.get_timetable_grid(db, timetable_id, **filters)
+        day_order = {d: i for i, d in enumerate(data["days"])}
+
+        sessions = {}
+        for time_key in data["times"]:
+            start, end = time_key.split("-")
+            for day, entries in data["grid"][time_key].items():
+                for entry in entries:
+                    key = (entry.id, day)
+                    session = sessions.get(key)
+                    if session is None:
+                        sessions[key] = {
+                            "id": entry.id,
+                            "course_code": entry.course_code,
+                            "course_title": entry.course_title,
+                            "department": entry.department,
+                            "level": entry.level,
+                            "lecturer_id": entry.lecturer_id,
+                            "lecturer": entry.lecturer_name,
+                            "venue_id": entry.venue_id,
+                            "venue": entry.venue_name,
+                            "day": day,
+                            "start": start,
+                            "end": end,
+                            "duration": entry.duration,
+                        }
+                    else:
+                        session["end"] = end
+
+        return sorted(sessions.values(), key=lambda s: (day_order[s["day"]], s["start"], s["course_code"]))
+
+    @staticmethod
+    def resolve_timetable(db: Session, timetable_id: str = None):
+        """
+        Look up a timetable by id. If no ID is provided, fall back to the
+        latest active timetable, then the latest generated one.
+        """
+        from app.domain.models import Timetable
+
+        if timetable_id:
+            return db.query(Timetable).filter(Timetable.id == timetable_id).first()
+        # Try get active first
+        active = db.query(Timetable).filter(Timetable.is_active == True).order_by(Timetable.created_at.desc()).first()
+        if active:
+            return active
+        # Get latest generated
+        return db.query(Timetable).order_by(Timetable.created_at.desc()).first()
+
+    @staticmethod
+    def query_grid_entries(db: Session, timetable_id: str, department: str = None, level: str = None,
+                           after: str = None, limit: int = None, **filters):
+        """
+        Fetch a timetable's entries as GridEntry tuples in one query.
+
+        Extra keyword filters are matched against TimetableEntry columns
+        (e.g. venue_id=...) or Course columns (e.g. lecturer_id=...).
+        With `limit`, returns one keyset page ordered by entry id, starting
+        after entry id `after`.
+        """
         query = (
-            db.query(TimetableEntry)
+            db.query(
+                TimetableEntry.id,
+                TimetableEntry.course_id,
+                Course.code,
+                Course.title,
+                Course.department,
+                Course.level,
+                Course.lecturer_id,
+                Lecturer.name,
+                TimetableEntry.venue_id,
+                Venue.name,
+                TimetableEntry.timeslot_id,
+                TimetableEntry.duration,
+                TimetableEntry.session_index,
+                TimetableEntry.is_locked,
+            )
+            .join(Course, Course.id == TimetableEntry.course_id)
+            .outerjoin(Lecturer, Lecturer.id == Course.lecturer_id)
+            .outerjoin(Venue, Venue.id == TimetableEntry.venue_id)  # LEFT JOIN for nullable venue_id
             .filter(TimetableEntry.timetable_id == timetable_id)
-            .join(TimetableEntry.course)
-            .join(TimetableEntry.timeslot)
-            .outerjoin(TimetableEntry.venue)  # LEFT JOIN for nullable venue_id
         )
         
         if department and department != "All":
             query = query.filter(Course.department == department)
         if level and level != "All":
             query = query.filter(Course.level == int(level))
-            
-        entries = query.all()
-        
-        # Structure data: grid[time_str][day_str] = [entry1, entry2...]
+        for column, value in filters.items():
+            model = TimetableEntry if hasattr(TimetableEntry, column) else Course
+            query = query.filter(getattr(model, column) == value)
+        if after is not None:
+            query = query.filter(TimetableEntry.id > after)
+        if limit is not None:
+            query = query.order_by(TimetableEntry.id).limit(limit)
+
+        return [
+            GridEntry(*row[:11], row[11] or 1, row[12] or 0, bool(row[13]))
+            for row in query.all()
+        ]
+
+    @staticmethod
+    def get_slots(db: Session, refresh: bool = False):
+        """Return the cached timeslot layout as SlotInfo tuples."""
+        global _slot_cache
+        slots = _slot_cache
+        if slots is None or refresh:
+            # Queried outside the lock: on the async path the query yields to
+            # other requests, which must not be left blocking on the lock
+            slots = [
+                SlotInfo(*row)
+                for row in db.query(TimeSlot.id, TimeSlot.day, TimeSlot.start_time, TimeSlot.end_time).all()
+            ]
+            with _slot_cache_lock:
+                _slot_cache = slots
+        return slots
+
+    @staticmethod
+    def _place_entries(db: Session, entries):
+        """
+        Expand each block into (entry, day, start_time, end_time) placements,
+        one per hour it covers. Returns (placements, all_slots).
+        """
+        all_slots = TimetableService.get_slots(db)
+        slots_by_id = {s.id: s for s in all_slots}
+        if any(e.timeslot_id not in slots_by_id for e in entries):
+            # Timeslots were changed by another process; reload once
+            all_slots = TimetableService.get_slots(db, refresh=True)
+            slots_by_id = {s.id: s for s in all_slots}
+        slots_by_day = TimetableService._group_slots_by_day(all_slots)
+
+        placements = []
+        for entry in entries:
+            start = slots_by_id.get(entry.timeslot_id)
+            if start is None:
+                continue
+            covered = TimetableService._block_slot_ids(slots_by_day, start, entry.duration or 1)
+            for slot_id in covered or [entry.timeslot_id]:
+                slot = slots_by_id[slot_id]
+                placements.append((entry, slot.day, slot.start_time, slot.end_time))
+        return placements, all_slots
+
+    @staticmethod
+    def _build_grid(placements, all_slots, timetable):
+        """Bucket placements into grid[time_str][day_str] = [entry1, entry2...]."""
         grid = {}
         
-        # Get all unique timeslots properly sorted
-        from app.domain.models.timeslot import TimeSlot, DayOfWeek
-        all_slots = db.query(TimeSlot).all()
-        
         # Sort days: Monday -> Friday
         day_order = {d.value: i for i, d in enumerate(DayOfWeek)}
         days = sorted([d.value for d in DayOfWeek], key=lambda d: day_order[d])
@@ -114,9 +291,9 @@ class TimetableService:
             grid[time_key] = {day: [] for day in days}
             
         # Populate grid
-        for entry in entries:
-            time_key = f"{entry.timeslot.start_time.strftime('%H:%M')}-{entry.timeslot.end_time.strftime('%H:%M')}"
-            day_key = entry.timeslot.day.value
+        for entry, day, start, end in placements:
+            time_key = f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}"
+            day_key = day.value
             if time_key in grid and day_key in grid[time_key]:
                 grid[time_key][day_key].append(entry)
                 
@@ -127,6 +304,47 @@ class TimetableService:
             "timetable": timetable
         }
 
+    @staticmethod
+    def filter_grid(data: dict, course_codes) -> dict:
+        """Copy of a grid structure keeping only entries of the given course codes."""
+        course_codes = set(course_codes)
+        grid = {
+            time_key: {
+                day: [e for e in entries if e.course_code in course_codes]
+                for day, entries in row.items()
+            }
+            for time_key, row in data["grid"].items()
+        }
+        return {**data, "grid": grid}
+
+    @staticmethod
+    def _group_slots_by_day(slots):
+        """Group timeslots by day, each day's slots sorted by start time."""
+        slots_by_day = {}
+        for slot in slots:
+            slots_by_day.setdefault(slot.day, []).append(slot)
+        for day_slots in slots_by_day.values():
+            day_slots.sort(key=lambda s: s.start_time)
+        return slots_by_day
+
+    @staticmethod
+    def _block_slot_ids(slots_by_day, start_slot, duration: int):
+        """
+        Return the ids of the consecutive slots covered by a block.
+        Returns None if the block runs past the end of the day or over a gap.
+        """
+        day_slots = slots_by_day.get(start_slot.day, [])
+        ids = [s.id for s in day_slots]
+        if start_slot.id not in ids:
+            return None
+        start_idx = ids.index(start_slot.id)
+        block = day_slots[start_idx:start_idx + duration]
+        if len(block) < duration:
+            return None
+        if any(prev.end_time != nxt.start_time for prev, nxt in zip(block, block[1:])):
+            return None
+        return [s.id for s in block]
+
     @staticmethod
     def get_entry(db: Session, entry_id: str):
         """Get a single timetable entry."""
@@ -135,50 +353,97 @@ class TimetableService:
     @staticmethod
     def update_entry(db: Session, entry_id: str, new_timeslot_id: str, new_venue_id: str):
         """
-        Update a timetable entry.
-        Also sets is_locked=True to prevent overwrite by auto-generation.
+        Move a timetable entry block to a new start slot and/or venue.
+        The whole block moves together, so this is a single-row update
+        guarded by one conflict query.
         Returns (success, message).
         """
         entry = db.query(TimetableEntry).filter(TimetableEntry.id == entry_id).first()
         if not entry:
             return False, "Entry not found."
 
-        # Check for conflicts within the SAME TIMETABLE
-        # 1. Venue Conflict
-        venue_conflict = db.query(TimetableEntry).filter(
-            TimetableEntry.timetable_id == entry.timetable_id, # Scope check
-            TimetableEntry.timeslot_id == new_timeslot_id,
-            TimetableEntry.venue_id == new_venue_id,
-            TimetableEntry.id != entry_id # Exclude self
-        ).first()
-        
-        if venue_conflict:
-            return False, f"Venue is already booked by {venue_conflict.course.code} at this time."
+        new_start = db.query(TimeSlot).filter(TimeSlot.id == new_timeslot_id).first()
+        if not new_start:
+            return False, "Time slot not found."
+
+        # Work out which hours the block will cover at its new position
+        day_slots = db.query(TimeSlot).filter(TimeSlot.day == new_start.day).all()
+        slots_by_day = TimetableService._group_slots_by_day(day_slots)
+        duration = entry.duration or 1
+        new_cover = TimetableService._block_slot_ids(slots_by_day, new_start, duration)
+        if new_cover is None:
+            return False, f"A {duration}-hour block does not fit at this time."
+
+        # Check for conflicts within the SAME TIMETABLE.
+        # Candidates are blocks starting on the same day that share the venue
+        # or the lecturer; their coverage is then compared hour by hour.
+        lecturer_id = entry.course.lecturer_id
+        clash_on = []
+        if new_venue_id:
+            clash_on.append(TimetableEntry.venue_id == new_venue_id)
+        if lecturer_id:
+            clash_on.append(Course.lecturer_id == lecturer_id)
 
-        # 2. Lecturer Conflict (if lecturer assigned)
-        if entry.course.lecturer_id:
-            lecturer_conflict = db.query(TimetableEntry).join(TimetableEntry.course).filter(
+        if clash_on:
+            candidates = db.query(TimetableEntry).join(TimetableEntry.course).filter(
                 TimetableEntry.timetable_id == entry.timetable_id, # Scope check
-                TimetableEntry.timeslot_id == new_timeslot_id,
-                Course.lecturer_id == entry.course.lecturer_id,
-                TimetableEntry.id != entry_id
-            ).first()
-            if lecturer_conflict:
-                return False, f"Lecturer is already teaching {lecturer_conflict.course.code} at this time."
+                TimetableEntry.timeslot_id.in_([s.id for s in day_slots]),
+                TimetableEntry.id != entry_id, # Exclude self
+                or_(*clash_on)
+            ).all()
+
+            new_cover_set = set(new_cover)
+            day_slots_by_id = {s.id: s for s in day_slots}
+            for other in candidates:
+                other_start = day_slots_by_id[other.timeslot_id]
+                other_cover = TimetableService._block_slot_ids(slots_by_day, other_start, other.duration or 1)
+                if new_cover_set.isdisjoint(other_cover or [other.timeslot_id]):
+                    continue
+                # 1. Venue Conflict
+                if new_venue_id and other.venue_id == new_venue_id:
+                    return False, f"Venue is already booked by {other.course.code} at this time."
+                # 2. Lecturer Conflict
+                return False, f"Lecturer is already teaching {other.course.code} at this time."
 
         # Update
         entry.timeslot_id = new_timeslot_id
-        entry.venue_id = new_venue_id
+        entry.venue_id = new_venue_id or None
         # entry.is_locked = True # Lock logic less relevant if we use drafts, but okay to keep.
+
+        # Bump the parent's version so version-keyed caches see the edit
+        entry.timetable.updated_at = datetime.utcnow()
+
+        # Keep the snapshot of an edited published timetable in step
+        from app.domain.models import TimetableStatus
+        if entry.timetable.status == TimetableStatus.PUBLISHED:
+            from app.domain.services.snapshot_service import SnapshotService
+            db.flush()
+            SnapshotService.build(db, entry.timetable, groups={(entry.course.department, entry.course.level)})
         db.commit()
         return True, "Entry updated successfully."
 
     @staticmethod
     def restore_timetable(db: Session):
-        """Unlock all entries (Restore)."""
-        db.query(TimetableEntry).update({TimetableEntry.is_locked: False})
+        """
+        Unlock all entries (Restore).
+        Returns the ids of the timetables that had locked entries.
+        """
+        from app.domain.models import Timetable
+
+        timetable_ids = [
+            row.timetable_id for row in
+            db.query(TimetableEntry.timetable_id).filter(TimetableEntry.is_locked == True).distinct()
+        ]
+        if timetable_ids:
+            db.query(TimetableEntry).filter(TimetableEntry.is_locked == True).update(
+                {TimetableEntry.is_locked: False}, synchronize_session=False
+            )
+            # Bump their versions so version-keyed caches and ETags see the change
+            db.query(Timetable).filter(Timetable.id.in_(timetable_ids)).update(
+                {Timetable.updated_at: datetime.utcnow()}, synchronize_session=False
+            )
         db.commit()
-        return True
+        return timetable_ids
 
     @staticmethod
     def get_all_timetables(db: Session):
@@ -198,16 +463,89 @@ class TimetableService:
         return False
         
     @staticmethod
-    def publish_timetable(db: Session, timetable_id: str):
+    def clone_timetable(db: Session, timetable_id: str):
+        """
+        Clone a timetable into a new Draft without re-running the solver.
+        Entries are copied server-side with a single INSERT ... SELECT.
+        Returns (success, new_timetable_id or message).
+        """
+        from sqlalchemy import insert, select, literal, cast, String
+        from app.domain.models import Timetable, TimetableStatus
+
+        source = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+        if not source:
+            return False, "Timetable not found."
+        if source.status == TimetableStatus.ARCHIVED:
+            return False, "Archived timetables cannot be cloned."
+
+        draft = Timetable(
+            academic_session=source.academic_session,
+            semester=source.semester,
+            status=TimetableStatus.DRAFT,
+            is_active=False,
+            parent_id=source.id
+        )
+        db.add(draft)
+        db.flush() # Get ID
+
+        # Entry ids are generated by the database so rows never leave the server
+        if db.get_bind().dialect.name == "postgresql":
+            new_id = cast(func.gen_random_uuid(), String)
+        else:
+            # uuid4 layout (version nibble 4, variant 8-b) to match str(uuid.uuid4())
+            new_id = func.lower(func.printf(
+                "%s-%s-4%s-%s%s-%s",
+                func.hex(func.randomblob(4)),
+                func.hex(func.randomblob(2)),
+                func.substr(func.hex(func.randomblob(2)), 2),
+                func.substr("89ab", 1 + func.abs(func.random()) % 4, 1),
+                func.substr(func.hex(func.randomblob(2)), 2),
+                func.hex(func.randomblob(6)),
+            ))
+
+        now = datetime.utcnow()
+        copy_columns = [
+            TimetableEntry.course_id,
+            TimetableEntry.timeslot_id,
+            TimetableEntry.venue_id,
+            TimetableEntry.duration,
+            TimetableEntry.session_index,
+            TimetableEntry.is_locked,
+        ]
+        rows = select(
+            new_id,
+            literal(draft.id),
+            *copy_columns,
+            literal(now),
+            literal(now)
+        ).where(TimetableEntry.timetable_id == source.id)
+
+        db.execute(
+            insert(TimetableEntry).from_select(
+                ["id", "timetable_id"] + [c.key for c in copy_columns] + ["created_at", "updated_at"],
+                rows
+            )
+        )
+        db.commit()
+        return True, draft.id
+
+    @staticmethod
+    def publish_timetable(db: Session, timetable_id: str, base_id: str = None, affected_groups=None):
         """
         Publish a timetable.
         Ensures only one active published timetable per (session, semester).
+        With the version it replaces (`base_id`) and the (department, level)
+        groups that differ from it, only those groups' snapshots are built;
+        the rest are copied from the base.
         """
         from app.domain.models import Timetable, TimetableStatus
         
         target = db.query(Timetable).filter(Timetable.id == timetable_id).first()
         if not target:
             return False, "Timetable not found."
+        if target.status == TimetableStatus.ARCHIVED:
+            # Its entries live only in the archive blob; publishing would show an empty grid
+            return False, "Archived timetables cannot be published."
             
         # Deactivate others for same session/semester
         db.query(Timetable).filter(
@@ -223,5 +561,12 @@ class TimetableService:
         
         target.status = TimetableStatus.PUBLISHED
         target.is_active = True
+
+        # Materialize the read-only student view of the published grid
+        from app.domain.services.snapshot_service import SnapshotService
+        if affected_groups is not None and base_id:
+            SnapshotService.build(db, target, groups=affected_groups, base_id=base_id)
+        else:
+            SnapshotService.build(db, target)
         db.commit()
         return True, "Timetable published successfully."
@@ -0,0 +1,7 @@
+"""In-process caching utilities."""
+
+from .lru import LRUCache
+
+__all__ = [
+    "LRUCache",
+]
@@ -0,0 +1,121 @@
+"""Size-bounded LRU cache.
+
+Thread-safe least-recently-used cache bounded by entry count and by the
+total size of the cached values, with optional per-entry expiry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Least-recently-used cache with entry and size limits.
+    
+    Values are sized with ``sizeof`` (``len`` by default); inserting past
+    either limit evicts the least recently used entries first. With ``ttl``
+    (seconds), entries also expire that long after being set.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_size: int = 32 * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = len, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[2] is not None and item[2] <= time.monotonic():
+                self._size -= self._data.pop(key)[1]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting old entries to stay within the limits.
+        
+        ``ttl`` overrides the cache's default expiry for this entry.
+        """
+        size = self._sizeof(value)
+        if size > self.max_size:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._data[key] = (value, size, expires_at)
+            self._size += size
+            while len(self._data) > self.max_entries or self._size > self.max_size:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._size -= evicted_size
+    
+    def delete(self, key: Hashable) -> bool:
+        """Drop one entry. Returns whether it was cached."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return False
+            self._size -= item[1]
+            return True
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches predicate. Returns the count."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                self._size -= self._data.pop(k)[1]
+            return len(doomed)
+    
+    def copy_keys(self, transform: Callable[[Hashable], Optional[Hashable]]) -> int:
+        """Also cache values under new keys.
+        
+        ``transform`` maps each key to the key its value should be copied to,
+        or None to skip it. Copies keep the original expiry. Returns the count.
+        """
+        with self._lock:
+            copies = []
+            for key, item in self._data.items():
+                new_key = transform(key)
+                if new_key is not None and new_key != key:
+                    copies.append((new_key, item))
+            for new_key, item in copies:
+                old = self._data.pop(new_key, None)
+                if old is not None:
+                    self._size -= old[1]
+                self._data[new_key] = item
+                self._size += item[1]
+            while len(self._data) > self.max_entries or self._size > self.max_size:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._size -= evicted_size
+            return len(copies)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Current counters, for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "size": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -9,6 +9,13 @@ from .connection import (
     SessionLocal,
     get_db,
     get_db_session,
+    dispose_engines,
+    get_read_session,
+    get_async_engine,
+    get_async_session,
+    get_async_read_session,
+    require_async_support,
+    read_router,
     init_db,
     drop_db,
 )
@@ -19,6 +26,13 @@ __all__ = [
     "SessionLocal",
     "get_db",
     "get_db_session",
+    "dispose_engines",
+    "get_read_session",
+    "get_async_engine",
+    "get_async_session",
+    "get_async_read_session",
+    "require_async_support",
+    "read_router",
     "init_db",
     "drop_db",
     "DBSessionMiddleware",
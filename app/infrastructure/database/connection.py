@@ -4,51 +4,97 @@ This module handles SQLAlchemy engine creation, session factory setup,
 and provides utilities for database connection management.
 """
 
+import itertools
+import math
+import threading
+import time
 from contextlib import contextmanager
-from typing import Generator
+from functools import lru_cache
+from typing import Generator, List, Optional
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from app.config import get_settings
 from app.domain.models.base import Base
 
-# Import all models to ensure they're registered with Base.metadata
-from app.domain.models import *
-
 
 # Get database URL from settings
 settings = get_settings()
 DATABASE_URL = settings.db_url
 
-# Create engine with appropriate configuration
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite configuration for development
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=settings.debug,
-    )
+
+def _is_sqlite_memory(url: str) -> bool:
+    """Whether a SQLite URL points at an in-memory database."""
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def create_db_engine(url: str, connect_timeout: Optional[float] = None) -> Engine:
+    """Create an engine for a database URL with the configured pool settings.
     
-    # Enable foreign key constraints for SQLite
-    @event.listens_for(Engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        """Enable foreign key constraints for SQLite connections."""
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-else:
-    # PostgreSQL configuration for production
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=10,
-        max_overflow=20,
-        echo=settings.debug,
-    )
+    ``connect_timeout`` bounds how long opening a PostgreSQL connection may
+    take (libpq counts whole seconds); SQLite files open without a network
+    round trip and ignore it.
+    """
+    if not url.startswith("sqlite"):
+        # PostgreSQL configuration for production
+        return create_engine(
+            url,
+            connect_args={"connect_timeout": max(1, math.ceil(connect_timeout))} if connect_timeout else {},
+            pool_pre_ping=True,  # Verify connections before using
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            echo=settings.debug,
+        )
+    
+    if _is_sqlite_memory(url):
+        # An in-memory database only exists inside its one connection
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=settings.debug,
+        )
+    else:
+        # File database: a real pool, so each thread gets its own connection
+        # and WAL lets readers run alongside the writer
+        sqlite_engine = create_engine(
+            url,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": settings.sqlite_busy_timeout,
+            },
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            echo=settings.debug,
+        )
+    event.listen(sqlite_engine, "connect", set_sqlite_pragma)
+    return sqlite_engine
+
+
+def set_sqlite_pragma(dbapi_conn, connection_record):
+    """Enable foreign keys and tune SQLite for concurrent web traffic."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Durable at checkpoints; safe with WAL and much cheaper per commit
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout * 1000)}")
+    cursor.close()
+
+
+# Primary engine: every write goes here
+engine = create_db_engine(DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -58,23 +104,251 @@ SessionLocal = sessionmaker(
 )
 
 
-def init_db() -> None:
-    """Initialize database by creating all tables.
+class ReadReplicaRouter:
+    """Hands out sessions on read replicas, round-robin.
+    
+    A background thread pings every replica (SELECT 1) once per health check
+    interval; requests only read its last verdict and skip replicas that
+    failed or have not been checked yet. With no replica configured, or
+    none healthy, sessions fall back to the primary. Replica engines use a short connect timeout so a dead
+    replica is noticed quickly. Replica sessions are marked
+    ``info["read_only"]`` so services can avoid writing through them.
+    """
+    
+    def __init__(self, urls: List[str], check_interval: float, connect_timeout: float):
+        self.urls = urls
+        self.check_interval = check_interval
+        self.connect_timeout = connect_timeout
+        self._factories = [
+            sessionmaker(autocommit=False, autoflush=False,
+                         bind=create_db_engine(url, connect_timeout=connect_timeout),
+                         info={"read_only": True})
+            for url in urls
+        ]
+        self._async_factories = {}
+        self._healthy = [False] * len(self._factories)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+    
+    @property
+    def engines(self) -> List[Engine]:
+        """Engines of the configured replicas."""
+        return [factory.kw["bind"] for factory in self._factories]
+    
+    def session(self) -> Session:
+        """A new session on the next healthy replica (or the primary)."""
+        index = self._pick()
+        return SessionLocal() if index is None else self._factories[index]()
+    
+    def async_session(self) -> AsyncSession:
+        """Async counterpart of session(), routed the same way."""
+        index = self._pick()
+        if index is None:
+            return get_async_session()
+        factory = self._async_factories.get(index)
+        if factory is None:
+            factory = self._async_factories.setdefault(index, async_sessionmaker(
+                create_async_db_engine(self.urls[index], connect_timeout=self.connect_timeout),
+                autoflush=False, expire_on_commit=False, info={"read_only": True}
+            ))
+        return factory()
+    
+    def _pick(self) -> Optional[int]:
+        """Index of the next healthy replica, or None to use the primary."""
+        count = len(self._factories)
+        if count:
+            self._ensure_monitor()
+            start = next(self._next)
+            for i in range(count):
+                index = (start + i) % count
+                if self._healthy[index]:
+                    return index
+        return None
+    
+    def _ensure_monitor(self) -> None:
+        """Start the health check thread in this process if it is not running.
+        
+        Started on first use rather than at import, so each forked worker
+        runs its own (threads do not survive a fork).
+        """
+        monitor = self._monitor
+        if monitor is not None and monitor.is_alive():
+            return
+        with self._lock:
+            if self._monitor is None or not self._monitor.is_alive():
+                self._monitor = threading.Thread(
+                    target=self._monitor_loop, name="replica-health", daemon=True
+                )
+                self._monitor.start()
+    
+    def _monitor_loop(self) -> None:
+        while True:
+            self.check()
+            time.sleep(self.check_interval)
+    
+    def check(self) -> None:
+        """Ping every replica now and record which ones answered."""
+        for index, replica in enumerate(self.engines):
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                healthy = True
+            except Exception:
+                healthy = False
+            self._healthy[index] = healthy
+    
+    def dispose(self) -> None:
+        """Drop the replicas' pooled connections without closing them (after fork)."""
+        for replica in self.engines:
+            replica.dispose(close=False)
+        for factory in self._async_factories.values():
+            factory.kw["bind"].sync_engine.dispose(close=False)
+    
+    def status(self) -> List[dict]:
+        """Health of each replica, for monitoring."""
+        return [
+            {"url": engine.url.render_as_string(hide_password=True), "healthy": healthy}
+            for engine, healthy in zip(self.engines, self._healthy)
+        ]
+
+
+read_router = ReadReplicaRouter(
+    settings.read_urls, settings.read_replica_check_interval, settings.read_replica_connect_timeout
+)
+
+
+def get_read_session() -> Session:
+    """Get a new session for read-only work, on a replica when one is available.
+    
+    Must be closed by the caller, like get_db_session().
+    """
+    return read_router.session()
+
+
+# Async drivers for each sync dialect
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def create_async_db_engine(url: str, connect_timeout: Optional[float] = None) -> AsyncEngine:
+    """Create an async engine (aiosqlite/asyncpg) for a sync database URL.
+    
+    Uses the same pool settings, connect timeout and SQLite pragmas as
+    create_db_engine.
+    """
+    if _is_sqlite_memory(url):
+        raise RuntimeError("An in-memory SQLite database cannot be shared with the async engine")
+    
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for {parsed.get_backend_name()}")
+    
+    options = dict(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        echo=settings.debug,
+    )
+    if parsed.get_backend_name() == "sqlite":
+        async_engine = create_async_engine(
+            parsed.set(drivername=driver),
+            connect_args={"timeout": settings.sqlite_busy_timeout},
+            **options,
+        )
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+        return async_engine
+    return create_async_engine(
+        parsed.set(drivername=driver),
+        connect_args={"timeout": connect_timeout} if connect_timeout else {},
+        pool_pre_ping=True,
+        **options,
+    )
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """The primary database's async engine, created on first use."""
+    return create_async_db_engine(DATABASE_URL)
+
+
+@lru_cache()
+def _async_session_factory() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+def get_async_session() -> AsyncSession:
+    """Get a new AsyncSession on the primary database.
     
-    Creates all tables defined in SQLAlchemy models.
-    Should be called once during application startup.
+    Must be closed by the caller (``await session.close()``), or used as
+    ``async with get_async_session() as session``.
     """
-    Base.metadata.create_all(bind=engine)
+    return _async_session_factory()()
+
+
+def get_async_read_session() -> AsyncSession:
+    """Get a new AsyncSession for read-only work, on a replica when one is available."""
+    return read_router.async_session()
+
+
+def require_async_support() -> None:
+    """Fail fast if the primary database cannot be reached by the async engine.
+    
+    The web app reads through AsyncSessions (authentication included), while
+    an in-memory SQLite database only exists inside the sync engine's single
+    connection. Scripts may still use one; the web app may not.
+    """
+    if _is_sqlite_memory(DATABASE_URL):
+        raise RuntimeError(
+            f"The web app cannot run on an in-memory SQLite database ({DATABASE_URL}): "
+            "it is not shared with the async engine. Use a file database "
+            "(e.g. sqlite:///./timetable_dev.db) or PostgreSQL."
+        )
+
+
+def dispose_engines() -> None:
+    """Drop pooled connections inherited from a parent process.
+    
+    Call in a freshly forked worker: the parent's connections stay open for
+    the parent (close=False), and the worker opens its own on first use.
+    """
+    engine.dispose(close=False)
+    if get_async_engine.cache_info().currsize:
+        get_async_engine().sync_engine.dispose(close=False)
+    read_router.dispose()
+
+
+def init_db() -> List[int]:
+    """Bring the database schema up to date.
+    
+    Applies every pending migration (see the migrations package) and returns
+    the versions applied. This is an explicit setup step (migrate.py,
+    init_db.py, seed_database.py); the web app does not run it.
+    """
+    from .migrations import Migrator
+    return Migrator(engine).upgrade()
 
 
 def drop_db() -> None:
-    """Drop all database tables.
+    """Drop all database tables and the migration history.
     
     WARNING: This will delete all data! Only use in development/testing.
     """
     if settings.environment == "production":
         raise RuntimeError("Cannot drop database in production environment!")
+    from .migrations import Migrator
+    _register_models()
     Base.metadata.drop_all(bind=engine)
+    Migrator(engine).reset()
+
+
+def _register_models() -> None:
+    """Import every model so all tables are registered on Base.metadata."""
+    import app.domain.models  # noqa: F401
 
 
 @contextmanager
@@ -3,31 +3,103 @@
 Provides database session management via middleware.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from typing import Callable, Optional
 
-from .connection import SessionLocal
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .connection import (
+    SessionLocal, get_read_session, get_async_session, get_async_read_session, read_router,
+)
 
-class DBSessionMiddleware(BaseHTTPMiddleware):
-    """Middleware to provide database session for each request.
-    
-    Automatically creates a database session for each request and
-    attaches it to request.state.db. Session is committed on success
-    and rolled back on error.
+# Requests under these paths never touch the database
+SKIP_PATHS = ("/assets", "/static", "/health", "/favicon.ico")
+
+
+class LazySession:
+    """Stand-in for a Session (or AsyncSession) that only opens the real one on first use.
+
+    Attribute access is forwarded to the underlying session, so handlers
+    use it exactly like a Session. Requests that never query the database
+    (cache hits, redirects) never open a session or check out a connection.
     """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session] = SessionLocal):
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    @property
+    def _opened(self) -> Optional[Session]:
+        """The real session, or None if it was never used."""
+        return self._session
+
+    def _open(self) -> Session:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._open(), name)
+
+
+class DBSessionMiddleware:
+    """Pure ASGI middleware providing a database session for each request.
+
+    Attaches a LazySession to request.state.db. If the session was used, it
+    is committed just before the response starts (so a failed commit still
+    produces an error response), rolled back on error, and closed once the
+    response has been sent. Static and health check paths are skipped.
+    
+    request.state.read_db is a second LazySession for read-only handlers,
+    opened on a read replica. Without replicas it is the same session as
+    request.state.db. It is never committed.
     
-    async def dispatch(self, request: Request, call_next):
-        """Process request with database session."""
-        db = SessionLocal()
-        request.state.db = db
-        
+    request.state.async_db and request.state.async_read_db are the
+    AsyncSession equivalents for handlers on the async read path. They are
+    opened lazily too, never committed, and closed at the end.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: tuple = SKIP_PATHS):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.skip_paths):
+            await self.app(scope, receive, send)
+            return
+
+        db = LazySession()
+        read_db = LazySession(get_read_session) if read_router.engines else db
+        async_db = LazySession(get_async_session)
+        async_read_db = LazySession(get_async_read_session) if read_router.engines else async_db
+        state = scope.setdefault("state", {})
+        state["db"] = db
+        state["read_db"] = read_db
+        state["async_db"] = async_db
+        state["async_read_db"] = async_read_db
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session = db._opened
+                if session is not None:
+                    session.commit()
+            await send(message)
+
         try:
-            response = await call_next(request)
-            db.commit()
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            db.rollback()
+            session = db._opened
+            if session is not None:
+                session.rollback()
             raise
         finally:
-            db.close()
+            for lazy in ((db,) if read_db is db else (db, read_db)):
+                session = lazy._opened
+                if session is not None:
+                    session.close()
+            for lazy in ((async_db,) if async_read_db is async_db else (async_db, async_read_db)):
+                session = lazy._opened
+                if session is not None:
+                    await session.close()
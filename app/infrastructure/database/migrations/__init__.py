@@ -0,0 +1,13 @@
+"""Schema migration package.
+
+Provides the versioned migration runner used by ``migrate.py`` and init_db.
+"""
+
+from .runner import Migration, MigrationContext, Migrator, discover
+
+__all__ = [
+    "Migration",
+    "MigrationContext",
+    "Migrator",
+    "discover",
+]
@@ -0,0 +1,184 @@
+"""Versioned schema migrations.
+
+Migrations are modules in the ``versions`` package named ``v<NNNN>_<slug>.py``.
+Each defines ``upgrade(ctx)`` and a docstring whose first line describes it.
+Applied versions are recorded in the ``schema_migrations`` table.
+
+Migrations run in autocommit mode, one statement at a time, because
+PostgreSQL cannot build an index CONCURRENTLY inside a transaction. Every
+step is therefore written to be safe to re-run: a migration that failed
+half-way is simply applied again. Migrations are forward-only.
+"""
+
+import importlib
+import pkgutil
+import re
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from . import versions as versions_package
+
+# Kept out of Base.metadata so drop_all/create_all never touch it
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True, comment="Applied migration number"),
+    Column("description", String(200), nullable=False, comment="What the migration does"),
+    Column("applied_at", DateTime, nullable=False, comment="UTC time the migration finished"),
+)
+
+# Serializes concurrent `migrate.py upgrade` runs on PostgreSQL
+ADVISORY_LOCK_ID = 7_245_019_263
+
+# Statements wait at most this long for a table lock, so a migration never
+# queues behind a long transaction while blocking every request behind it
+LOCK_TIMEOUT = "5s"
+
+_MODULE_NAME = re.compile(r"^v(\d{4})_\w+$")
+
+
+class Migration(NamedTuple):
+    """A migration module found in the versions package."""
+    version: int
+    description: str
+    module: object
+
+
+class MigrationContext:
+    """Schema operations available to a migration's ``upgrade(ctx)``.
+
+    Helpers check the live schema first, so each one is a no-op if its
+    change is already in place.
+    """
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.dialect == "postgresql"
+
+    def execute(self, sql: str, **params):
+        """Run one SQL statement."""
+        return self.connection.execute(text(sql), params)
+
+    def has_table(self, table: str) -> bool:
+        return inspect(self.connection).has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        return any(c["name"] == column for c in inspect(self.connection).get_columns(table))
+
+    def create_tables(self, metadata: MetaData, tables: Optional[Iterable[str]] = None) -> None:
+        """Create the given tables of a metadata (default: all) that do not exist yet."""
+        selected = None if tables is None else [metadata.tables[name] for name in tables]
+        metadata.create_all(self.connection, tables=selected, checkfirst=True)
+
+    def add_column(self, table: str, column: str, ddl: str) -> None:
+        """
+        Add a column, e.g. ``ctx.add_column("t", "n", "INTEGER NOT NULL DEFAULT 0")``.
+        Nullable columns and constant defaults are metadata-only changes on
+        PostgreSQL 11+ and SQLite, so the table is not rewritten.
+        """
+        if not self.has_column(table, column):
+            self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+    def create_index(self, name: str, table: str, columns: List[str], unique: bool = False) -> None:
+        """
+        Create an index without blocking writes. On PostgreSQL it is built
+        CONCURRENTLY; an invalid leftover of an interrupted build is dropped
+        and rebuilt.
+        """
+        if self.is_postgres:
+            invalid = self.execute(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid",
+                name=name,
+            ).first()
+            if invalid:
+                self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        concurrently = "CONCURRENTLY " if self.is_postgres else ""
+        self.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {concurrently}IF NOT EXISTS "
+            f"{name} ON {table} ({', '.join(columns)})"
+        )
+
+
+def discover() -> List[Migration]:
+    """All migrations in the versions package, ordered by version."""
+    migrations = []
+    for info in pkgutil.iter_modules(versions_package.__path__):
+        match = _MODULE_NAME.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions_package.__name__}.{info.name}")
+        description = (module.__doc__ or info.name).strip().splitlines()[0].rstrip(".")
+        migrations.append(Migration(int(match.group(1)), description, module))
+    migrations.sort(key=lambda m: m.version)
+    for previous, current in zip(migrations, migrations[1:]):
+        if previous.version == current.version:
+            raise RuntimeError(f"Duplicate migration version {current.version:04d}")
+    return migrations
+
+
+class Migrator:
+    """Applies pending migrations to a database."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def _connect(self) -> Connection:
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def applied(self) -> List[int]:
+        """Versions already applied, in order."""
+        with self._connect() as conn:
+            if not inspect(conn).has_table(schema_migrations.name):
+                return []
+            return list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+    def current(self) -> Optional[int]:
+        """Latest applied version, or None for an unmigrated database."""
+        applied = self.applied()
+        return applied[-1] if applied else None
+
+    def pending(self) -> List[Migration]:
+        """Migrations not applied yet."""
+        done = set(self.applied())
+        return [m for m in discover() if m.version not in done]
+
+    def upgrade(self, target: Optional[int] = None, log=print) -> List[int]:
+        """Apply pending migrations up to `target` (default: all). Returns the versions applied."""
+        with self._connect() as conn:
+            ctx = MigrationContext(conn)
+            if ctx.is_postgres:
+                ctx.execute("SELECT pg_advisory_lock(:id)", id=ADVISORY_LOCK_ID)
+                ctx.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+            try:
+                migration_metadata.create_all(conn, checkfirst=True)
+                done = set(conn.execute(select(schema_migrations.c.version)).scalars())
+                applied = []
+                for migration in discover():
+                    if migration.version in done or (target is not None and migration.version > target):
+                        continue
+                    log(f"[MIGRATE] {migration.version:04d} {migration.description}")
+                    migration.module.upgrade(ctx)
+                    conn.execute(schema_migrations.insert().values(
+                        version=migration.version,
+                        description=migration.description[:200],
+                        applied_at=datetime.utcnow(),
+                    ))
+                    applied.append(migration.version)
+                return applied
+            finally:
+                if ctx.is_postgres:
+                    ctx.execute("SELECT pg_advisory_unlock(:id)", id=ADVISORY_LOCK_ID)
+
+    def reset(self) -> None:
+        """Forget every applied migration (after the schema has been dropped)."""
+        with self._connect() as conn:
+            schema_migrations.drop(conn, checkfirst=True)
@@ -0,0 +1,13 @@
+"""Create the base schema.
+
+Creates every model table that does not exist yet. On an empty database
+this builds the current schema in one go, and the later migrations find
+their changes already in place. On a database created by the old
+create_all() it only adds the missing tables.
+"""
+
+from app.domain.models import Base
+
+
+def upgrade(ctx) -> None:
+    ctx.create_tables(Base.metadata)
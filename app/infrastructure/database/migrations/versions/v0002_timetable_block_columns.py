@@ -0,0 +1,12 @@
+"""Add clone parent and session block columns.
+
+Existing entries become one-hour blocks (duration 1). The columns are
+nullable or have constant defaults, so no table is rewritten.
+"""
+
+
+def upgrade(ctx) -> None:
+    ctx.add_column("timetables", "parent_id",
+                   "VARCHAR(36) REFERENCES timetables(id) ON DELETE SET NULL")
+    ctx.add_column("timetable_entries", "duration", "INTEGER NOT NULL DEFAULT 1")
+    ctx.add_column("timetable_entries", "session_index", "INTEGER NOT NULL DEFAULT 0")
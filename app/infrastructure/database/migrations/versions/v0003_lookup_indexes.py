@@ -0,0 +1,23 @@
+"""Add timetable entry and course lookup indexes.
+
+Built CONCURRENTLY on PostgreSQL, so reads and writes continue while the
+indexes are created.
+"""
+
+INDEXES = [
+    ("ix_timetable_entries_timetable_slot_venue", "timetable_entries", ["timetable_id", "timeslot_id", "venue_id"]),
+    ("ix_timetable_entries_timetable_course", "timetable_entries", ["timetable_id", "course_id"]),
+    ("ix_timetable_entries_timetable_venue", "timetable_entries", ["timetable_id", "venue_id"]),
+    ("ix_timetable_entries_course_id", "timetable_entries", ["course_id"]),
+    ("ix_timetable_entries_timeslot_id", "timetable_entries", ["timeslot_id"]),
+    ("ix_timetable_entries_venue_id", "timetable_entries", ["venue_id"]),
+    ("ix_courses_level", "courses", ["level"]),
+    ("ix_courses_lecturer_id", "courses", ["lecturer_id"]),
+    ("ix_courses_department", "courses", ["department"]),
+    ("ix_courses_semester", "courses", ["semester"]),
+]
+
+
+def upgrade(ctx) -> None:
+    for name, table, columns in INDEXES:
+        ctx.create_index(name, table, columns)
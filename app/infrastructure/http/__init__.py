@@ -0,0 +1,37 @@
+"""HTTP helpers package."""
+
+from .caching import (
+    PUBLISHED_CACHE_CONTROL,
+    DRAFT_CACHE_CONTROL,
+    PRIVATE_CACHE_CONTROL,
+    make_etag,
+    is_not_modified,
+    cache_headers,
+    not_modified_response,
+)
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    parse_limit,
+    parse_fields,
+)
+from .responses import ORJSONResponse
+
+__all__ = [
+    "PUBLISHED_CACHE_CONTROL",
+    "DRAFT_CACHE_CONTROL",
+    "PRIVATE_CACHE_CONTROL",
+    "make_etag",
+    "is_not_modified",
+    "cache_headers",
+    "not_modified_response",
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "encode_cursor",
+    "decode_cursor",
+    "parse_limit",
+    "parse_fields",
+    "ORJSONResponse",
+]
@@ -0,0 +1,76 @@
+"""HTTP conditional request utilities.
+
+Builds strong ETags and Last-Modified validators for versioned resources
+and answers conditional GETs with 304 Not Modified.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Published timetables only change on re-publish or edit: let browsers and
+# proxies reuse them briefly, then revalidate with the ETag.
+PUBLISHED_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+# Drafts change constantly: always revalidate, never store in shared caches.
+DRAFT_CACHE_CONTROL = "private, no-cache"
+# Per-user pages (admin views) must never be shared.
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the parts identifying a representation."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the client's cached copy is still current.
+    
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # Weak comparison: a W/ prefix added by a proxy still matches
+        return etag in tags or f"W/{etag}" in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime], cache_control: str,
+                  vary: str = "HX-Request") -> Dict[str, str]:
+    """Validator and policy headers for a cacheable response."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    if vary:
+        # HTMX partials and full pages share URLs but not bodies
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(status_code=304, headers=headers)
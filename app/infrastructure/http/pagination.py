@@ -0,0 +1,60 @@
+"""Keyset pagination and sparse field selection helpers for JSON APIs."""
+
+import base64
+import binascii
+from typing import Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key: str) -> str:
+    """Opaque cursor for the last key of a page."""
+    return base64.urlsafe_b64encode(str(key).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Key encoded in a cursor, or None for the first page.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(limit: Optional[str]) -> int:
+    """Validate a page size, defaulting to DEFAULT_PAGE_SIZE.
+    
+    Raises:
+        ValueError: If the limit is not an integer in 1..MAX_PAGE_SIZE
+    """
+    if limit in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        value = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if not 1 <= value <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return value
+
+
+def parse_fields(fields: Optional[str], available: Sequence[str]) -> Tuple[str, ...]:
+    """Fields requested with ``fields=a,b``, or all available fields.
+    
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return tuple(available)
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return requested or tuple(available)
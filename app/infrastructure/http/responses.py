@@ -0,0 +1,19 @@
+"""JSON response types.
+
+Serializes with orjson, which handles datetimes, enums and named tuples
+natively and is several times faster than the standard library encoder.
+"""
+
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson."""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
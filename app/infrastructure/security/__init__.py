@@ -1,11 +1,36 @@
 """Security utilities package."""
 
-from .password import hash_password, verify_password
+from .password import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_pool_stats,
+    shutdown_password_pool,
+    PasswordHasherBusy,
+)
+from .ratelimit import (
+    LoginRateLimiter,
+    MemoryRateLimitStore,
+    SQLiteRateLimitStore,
+    RateLimited,
+    get_login_limiter,
+)
 from .jwt import create_access_token, verify_token, decode_token
 
 __all__ = [
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "password_pool_stats",
+    "shutdown_password_pool",
+    "PasswordHasherBusy",
+    "LoginRateLimiter",
+    "MemoryRateLimitStore",
+    "SQLiteRateLimitStore",
+    "RateLimited",
+    "get_login_limiter",
     "create_access_token",
     "verify_token",
     "decode_token",
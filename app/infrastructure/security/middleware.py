@@ -3,36 +3,61 @@
 Handles request authentication and user session population.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import RedirectResponse
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse, RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.domain.services.auth import AuthService
 
+# Routes reachable without logging in
+PUBLIC_PATHS = frozenset(["/", "/login", "/health", "/favicon.ico", "/api/v1/token"])
+PUBLIC_PREFIXES = ("/static", "/assets", "/student", "/timetable/export-pdf")
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to check authentication status and populate user."""
-    
-    async def dispatch(self, request: Request, call_next):
+
+class AuthMiddleware:
+    """Pure ASGI middleware to check authentication status and populate user."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip auth check for public routes and static files
-        public_paths = ["/", "/login", "/health", "/favicon.ico"]
-        if (request.url.path in public_paths or 
-            request.url.path.startswith(("/static", "/assets", "/student", "/timetable/export-pdf"))):
-            return await call_next(request)
-            
-        token = request.cookies.get("access_token")
-        if not token:
-            # Redirect to login if accessing protected route
-            return RedirectResponse(url="/login", status_code=303)
-            
-        # We need the DB session to get the user
-        # Note: Usually DB middleware runs before this, so request.state.db should exist
-        db = getattr(request.state, "db", None)
-        
-        if db:
-            user = AuthService.get_current_user_from_token(token, db)
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        conn = HTTPConnection(scope)
+
+        # API clients send the JWT as a bearer token instead of the cookie
+        is_api = path.startswith("/api/")
+        token = conn.cookies.get("access_token")
+        authorization = conn.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            token = authorization[7:].strip()
+
+        # The user is looked up on the async session, so a cache miss does
+        # not block the event loop
+        # Note: DB middleware runs before this, so request.state.async_db should exist
+        db = getattr(conn.state, "async_db", None)
+
+        if token and db is not None:
+            user = await AuthService.get_current_user_from_token_async(token, db)
             if user:
-                request.state.user = user
-                return await call_next(request)
-        
-        # If token invalid or user not found
+                conn.state.user = user
+                await self.app(scope, receive, send)
+                return
+
+        # No token, invalid token or user not found
+        response = self._unauthorized(is_api)
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _unauthorized(is_api: bool):
+        """API requests get a 401; browser requests are sent to the login page."""
+        if is_api:
+            return JSONResponse(
+                {"error": "Not authenticated"},
+                status_code=401,
+                headers={"WWW-Authenticate": "Bearer"}
+            )
         return RedirectResponse(url="/login", status_code=303)
@@ -1,7 +1,14 @@
 """Password hashing and verification utilities using bcrypt."""
 
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
 import bcrypt
 
+from app.config import get_settings
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
@@ -31,3 +38,109 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many password checks are already waiting for a worker."""
+
+
+class _PasswordPool:
+    """Bounded thread pool for bcrypt work.
+    
+    bcrypt releases the GIL, so hashing in threads keeps the event loop
+    responsive. At most ``workers`` hashes run at once and at most
+    ``max_queue`` wait; beyond that callers get PasswordHasherBusy
+    instead of piling up behind a login spike. A caller cancelled while
+    its job is still waiting (client disconnect, timeout) cancels the job
+    and frees its queue slot.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    async def run(self, func: Callable, *args):
+        with self._lock:
+            if self.queued + self.active >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many password checks in progress")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            self.queued += 1
+            executor = self._executor
+        future = executor.submit(self._call, func, args)
+        future.add_done_callback(self._release_cancelled)
+        return await asyncio.wrap_future(future)
+    
+    def _release_cancelled(self, future: Future) -> None:
+        # A caller cancelled while still queued: the job never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+    
+    def _call(self, func: Callable, args: tuple):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Current counters, for monitoring."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "active": self.active,
+                "queued": self.queued,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_settings = get_settings()
+_pool = _PasswordPool(_settings.password_hash_workers, _settings.password_hash_max_queue)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password, run on the bounded bcrypt pool.
+    
+    Raises:
+        PasswordHasherBusy: If the pool's wait queue is full
+    """
+    return await _pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password, run on the bounded bcrypt pool.
+    
+    Raises:
+        PasswordHasherBusy: If the pool's wait queue is full
+    """
+    return await _pool.run(verify_password, plain_password, hashed_password)
+
+
+def password_pool_stats() -> Dict[str, int]:
+    """Queue depth and throughput counters of the bcrypt pool."""
+    return _pool.stats()
+
+
+def shutdown_password_pool() -> None:
+    """Stop the bcrypt worker threads."""
+    _pool.shutdown()
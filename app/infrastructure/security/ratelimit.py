@@ -0,0 +1,201 @@
+"""Sliding-window rate limiting for login attempts.
+
+Each key (e.g. ``user:alice`` or ``ip:10.0.0.1``) may make at most ``limit``
+attempts in any ``window`` seconds. Attempt times are kept in a store: the
+in-process store suits a single worker, the SQLite store shares the
+counters between workers on one host.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Optional
+
+from app.config import get_settings
+
+
+class RateLimited(Exception):
+    """Raised when a key has used up its attempts for the current window."""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Too many attempts ({scope}), retry in {retry_after:.0f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class MemoryRateLimitStore:
+    """In-process store: a deque of attempt times per key."""
+
+    # Sweep keys whose attempts have all expired every this many hits
+    SWEEP_EVERY = 1024
+
+    def __init__(self):
+        self._hits: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def hit(self, key: str, now: float, window: float, limit: int) -> Optional[float]:
+        """
+        Record an attempt if the key is under its limit. Returns None when
+        the attempt is allowed, else the seconds until one becomes free.
+        """
+        cutoff = now - window
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(cutoff)
+
+            hits = self._hits.setdefault(key, deque())
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] - cutoff
+            hits.append(now)
+            return None
+
+    def reset(self, key: str) -> None:
+        """Forget every attempt of a key."""
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def size(self) -> int:
+        """Number of keys currently tracked."""
+        return len(self._hits)
+
+    def _sweep(self, cutoff: float) -> None:
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= cutoff]:
+            del self._hits[key]
+
+
+class SQLiteRateLimitStore:
+    """SQLite store shared by every worker process using the same file.
+
+    Each hit runs in one IMMEDIATE transaction, so the check and the insert
+    are atomic across processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS login_attempts (key TEXT NOT NULL, at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_login_attempts_key_at ON login_attempts (key, at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread, opened in autocommit mode."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key: str, now: float, window: float, limit: int) -> Optional[float]:
+        """Same contract as MemoryRateLimitStore.hit."""
+        cutoff = now - window
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM login_attempts WHERE key = ? AND at <= ?", (key, cutoff))
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(at) FROM login_attempts WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= limit:
+                retry_after = oldest - cutoff
+            else:
+                conn.execute("INSERT INTO login_attempts (key, at) VALUES (?, ?)", (key, now))
+                retry_after = None
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def reset(self, key: str) -> None:
+        """Forget every attempt of a key."""
+        self._connect().execute("DELETE FROM login_attempts WHERE key = ?", (key,))
+
+    def size(self) -> int:
+        """Number of keys currently tracked."""
+        return self._connect().execute(
+            "SELECT COUNT(DISTINCT key) FROM login_attempts"
+        ).fetchone()[0]
+
+
+class LoginRateLimiter:
+    """Per-username and per-client-IP sliding-window limits on login attempts."""
+
+    def __init__(self, store, per_user: int, per_ip: int, window: float):
+        self.store = store
+        self.per_user = per_user
+        self.per_ip = per_ip
+        self.window = window
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = {"user": 0, "ip": 0}
+
+    def check(self, username: str, client_ip: Optional[str]) -> None:
+        """
+        Record a login attempt, or raise RateLimited if the client IP or the
+        username has no attempts left. The IP is checked first so a flood
+        from one address does not also lock its victims' accounts.
+        """
+        now = time.time()
+        checks = []
+        if client_ip and self.per_ip:
+            checks.append(("ip", f"ip:{client_ip}", self.per_ip))
+        if self.per_user:
+            checks.append(("user", f"user:{username.strip().lower()}", self.per_user))
+
+        for scope, key, limit in checks:
+            retry_after = self.store.hit(key, now, self.window, limit)
+            if retry_after is not None:
+                with self._lock:
+                    self.rejected[scope] += 1
+                raise RateLimited(scope, max(retry_after, 1.0))
+        with self._lock:
+            self.allowed += 1
+
+    def succeeded(self, username: str) -> None:
+        """Clear a username's attempts after a successful login."""
+        if self.per_user:
+            self.store.reset(f"user:{username.strip().lower()}")
+
+    def stats(self) -> dict:
+        """Attempt counters for monitoring."""
+        return {
+            "store": type(self.store).__name__,
+            "window": self.window,
+            "per_user": self.per_user,
+            "per_ip": self.per_ip,
+            "allowed": self.allowed,
+            "rejected_user": self.rejected["user"],
+            "rejected_ip": self.rejected["ip"],
+            "tracked_keys": self.store.size(),
+        }
+
+
+@lru_cache()
+def get_login_limiter() -> LoginRateLimiter:
+    """Get the application's login rate limiter."""
+    settings = get_settings()
+    if settings.login_rate_limit_store == "sqlite":
+        store = SQLiteRateLimitStore(settings.login_rate_limit_sqlite_path)
+    else:
+        store = MemoryRateLimitStore()
+    return LoginRateLimiter(
+        store,
+        per_user=settings.login_rate_limit_per_user,
+        per_ip=settings.login_rate_limit_per_ip,
+        window=settings.login_rate_limit_window,
+    )
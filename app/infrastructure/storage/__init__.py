@@ -0,0 +1,8 @@
+"""File artifact storage package."""
+
+from .artifacts import ArtifactStore, get_artifact_store
+
+__all__ = [
+    "ArtifactStore",
+    "get_artifact_store",
+]
@@ -0,0 +1,139 @@
+"""Versioned on-disk artifact store.
+
+Stores generated files (e.g. timetable PDFs) under
+``<root>/<namespace>/<owner_id>/<version>/<name>``. Only the latest version
+of each owner is kept: writing a version removes the older ones. Versions
+are compared as strings, so they must sort in order (ISO timestamps do).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional
+
+from app.config import get_settings
+
+# File in each version directory recording its (unhashed) version
+VERSION_MARKER = ".version"
+
+
+def _safe(part: str) -> str:
+    """Hash a key part into a filesystem-safe name."""
+    return hashlib.sha1(str(part).encode("utf-8")).hexdigest()[:20]
+
+
+class ArtifactStore:
+    """Filesystem store for generated artifacts keyed by owner and version."""
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+    
+    def path(self, namespace: str, owner_id: str, version: str, name: str) -> Path:
+        """Location of an artifact (whether or not it exists yet)."""
+        return self.root / namespace / _safe(owner_id) / _safe(version) / _safe(name)
+    
+    def get(self, namespace: str, owner_id: str, version: str, name: str) -> Optional[Path]:
+        """Path of a stored artifact, or None if it has not been generated."""
+        path = self.path(namespace, owner_id, version, name)
+        return path if path.is_file() else None
+    
+    def put(self, namespace: str, owner_id: str, version: str, name: str, data: bytes) -> Path:
+        """Store an artifact atomically and drop older versions of the owner."""
+        return self.write(namespace, owner_id, version, name, lambda f: f.write(data))
+    
+    def write(self, namespace: str, owner_id: str, version: str, name: str,
+              writer: Callable[[BinaryIO], None]) -> Path:
+        """
+        Store an artifact produced by ``writer``, which streams into an open
+        temp file, so the content never has to be held in memory. The file
+        is moved into place atomically once complete.
+        """
+        path = self.path(namespace, owner_id, version, name)
+        self._make_version_dir(path.parent, version)
+        
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        
+        self._prune(path.parent, version)
+        return path
+    
+    def carry(self, namespace: str, owner_id: str, version: str, to_owner_id: str, to_version: str,
+              names: Iterable[str]) -> int:
+        """
+        Copy the stored artifacts ``names`` of one owner version to another
+        (hard links where possible: stored files are only ever replaced,
+        never modified), then drop the target owner's older versions.
+        Returns the number copied.
+        """
+        copied = 0
+        for name in names:
+            source = self.get(namespace, owner_id, version, name)
+            target = self.path(namespace, to_owner_id, to_version, name)
+            if source is None or target.is_file():
+                continue
+            self._make_version_dir(target.parent, to_version)
+            try:
+                os.link(source, target)
+            except OSError:
+                fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+                os.close(fd)
+                shutil.copyfile(source, tmp)
+                os.replace(tmp, target)
+            copied += 1
+        if copied:
+            self._prune(self.root / namespace / _safe(to_owner_id) / _safe(to_version), to_version)
+        return copied
+    
+    def discard(self, namespace: str, owner_id: str) -> None:
+        """Remove every stored artifact of an owner."""
+        shutil.rmtree(self.root / namespace / _safe(owner_id), ignore_errors=True)
+    
+    @staticmethod
+    def _make_version_dir(version_dir: Path, version: str) -> None:
+        """
+        Create a version directory together with its version marker. The
+        directory is assembled under a temp name and renamed into place, so
+        a concurrent prune never sees it without its marker.
+        """
+        if version_dir.is_dir():
+            return
+        version_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=version_dir.parent, suffix=".tmp"))
+        (tmp / VERSION_MARKER).write_text(version, encoding="utf-8")
+        try:
+            os.rename(tmp, version_dir)
+        except OSError:
+            # Another writer created it first
+            shutil.rmtree(tmp, ignore_errors=True)
+    
+    def _prune(self, current_version_dir: Path, version: str) -> None:
+        """
+        Remove the owner's version directories older than ``version``.
+        Newer ones are kept, so a slow render of an old version that
+        finishes late cannot delete the current files.
+        """
+        for sibling in current_version_dir.parent.iterdir():
+            if sibling == current_version_dir or not sibling.is_dir() or sibling.suffix == ".tmp":
+                continue
+            try:
+                sibling_version = (sibling / VERSION_MARKER).read_text(encoding="utf-8")
+            except OSError:
+                sibling_version = ""  # Unmarked (pre-marker) directories are stale
+            if sibling_version < version:
+                shutil.rmtree(sibling, ignore_errors=True)
+
+
+@lru_cache()
+def get_artifact_store() -> ArtifactStore:
+    """Get the application's artifact store."""
+    return ArtifactStore(get_settings().artifact_dir)
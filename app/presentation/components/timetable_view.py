@@ -1,11 +1,20 @@
 from fasthtml.common import *
 from faststrap import *
-from app.domain.models import Timetable, Course, TimetableEntry
+from app.domain.services.timetable_service import GridEntry
+from app.infrastructure.cache import LRUCache
+from app.config import get_settings
 
-def CourseCard(entry: TimetableEntry, readonly: bool = False):
+# Rendered grid HTML keyed by (timetable id, updated_at, department, level, readonly)
+_settings = get_settings()
+grid_fragment_cache = LRUCache(
+    max_entries=_settings.fragment_cache_max_entries,
+    max_size=_settings.fragment_cache_max_bytes
+)
+
+def CourseCard(entry: GridEntry, readonly: bool = False):
     """Render a course card for the grid."""
     # Check if venue is assigned
-    if entry.venue is None:
+    if entry.venue_name is None:
         # Unassigned course - use secondary color
         color = "secondary"
         venue_display = Div(
@@ -16,10 +25,10 @@ def CourseCard(entry: TimetableEntry, readonly: bool = False):
     else:
         # Assigned course - normal color mapping
         colors = ["primary", "success", "info", "warning", "danger", "dark"]
-        color = colors[hash(entry.course.department) % len(colors)]
+        color = colors[hash(entry.department) % len(colors)]
         venue_display = Div(
             Icon("geo-alt-fill", cls="process-icon me-1"),
-            Span(entry.venue.name, cls="small"),
+            Span(entry.venue_name, cls="small"),
             cls="d-flex align-items-center mb-1"
         )
     
@@ -29,11 +38,11 @@ def CourseCard(entry: TimetableEntry, readonly: bool = False):
         extras.append(Icon("lock-fill", cls="position-absolute top-0 end-0 m-2 small"))
     
     # Read-only specific: Show lecturer
-    if readonly and entry.course.lecturer:
+    if readonly and entry.lecturer_name:
         extras.append(
              Div(
                 Icon("person-fill", cls="me-1", style="font-size: 0.75rem;"),
-                Span(entry.course.lecturer.name, cls="small"), # Full name for clarity
+                Span(entry.lecturer_name, cls="small"), # Full name for clarity
                 cls="d-flex align-items-center mt-1",
                 style="font-size: 0.8rem; opacity: 0.9;"
             )
@@ -42,11 +51,11 @@ def CourseCard(entry: TimetableEntry, readonly: bool = False):
     card_content = Div(
         Div(
             Div(
-                H2(entry.course.code, cls="h6 fw-bold mb-1"),
+                H2(entry.course_code, cls="h6 fw-bold mb-1"),
                 venue_display,
                 cls="d-flex justify-content-between align-items-center"
             ),
-            Badge(entry.course.department, bg="white", text=color, cls="border"),
+            Badge(entry.department, bg="white", text=color, cls="border"),
             *extras,
             cls="card-body p-2 position-relative"
         ),
@@ -60,11 +69,11 @@ def CourseCard(entry: TimetableEntry, readonly: bool = False):
         return Div(
             Div(
                 Div(
-                    H2(entry.course.code, cls="h6 fw-bold mb-1"),
+                    H2(entry.course_code, cls="h6 fw-bold mb-1"),
                     venue_display,
                     cls="d-flex justify-content-between align-items-center"
                 ),
-                Badge(entry.course.department, bg="white", text=color, cls="border"),
+                Badge(entry.department, bg="white", text=color, cls="border"),
                 *extras,
                 cls="card-body p-2 position-relative"
             ),
@@ -110,3 +119,61 @@ def TimetableGrid(data: dict, readonly: bool = False):
         ),
         cls="shadow-sm border-0"
     )
+
+
+def CachedTimetableGrid(timetable, department: str, level: str, load_data, readonly: bool = False, scope: tuple = ()):
+    """
+    Render TimetableGrid through the fragment cache.
+
+    `load_data` is only called on a cache miss, so hits skip both the grid
+    query and component rendering. `scope` distinguishes grids narrowed to
+    one resource, e.g. ("venue", venue_id).
+    """
+    key = (timetable.id, timetable.updated_at, department, level, readonly, *scope)
+    html = grid_fragment_cache.get(key)
+    if html is None:
+        html = to_xml(TimetableGrid(load_data(), readonly=readonly))
+        grid_fragment_cache.set(key, html)
+    return NotStr(html)
+
+
+async def CachedTimetableGridAsync(timetable, department: str, level: str, load_data, readonly: bool = False,
+                                   scope: tuple = ()):
+    """CachedTimetableGrid for the async read path: `load_data` returns an awaitable."""
+    key = (timetable.id, timetable.updated_at, department, level, readonly, *scope)
+    html = grid_fragment_cache.get(key)
+    if html is None:
+        html = to_xml(TimetableGrid(await load_data(), readonly=readonly))
+        grid_fragment_cache.set(key, html)
+    return NotStr(html)
+
+
+def invalidate_timetable_fragments(timetable_id: str, keep_version=None) -> int:
+    """Drop every cached grid fragment of a timetable, except those of `keep_version`."""
+    return grid_fragment_cache.invalidate(
+        lambda key: key[0] == timetable_id and (keep_version is None or key[1] != keep_version)
+    )
+
+
+def carry_timetable_fragments(source_id: str, source_version, target, affected_groups) -> int:
+    """
+    Reuse the cached grids a change did not touch.
+
+    Unscoped fragments of `source_id` at `source_version` whose (department,
+    level) filter shows none of `affected_groups` are copied to `target`'s
+    current version. Across timetables (a publish) only read-only fragments
+    are copied, since editable cards embed entry ids. Returns the count.
+    """
+    from app.domain.services.diff_service import TimetableDiffService
+
+    same_timetable = source_id == target.id
+
+    def transform(key):
+        timetable_id, version, department, level, readonly, *scope = key
+        if timetable_id != source_id or version != source_version or scope:
+            return None
+        if not (readonly or same_timetable) or TimetableDiffService.touches(affected_groups, department, level):
+            return None
+        return (target.id, target.updated_at, department, level, readonly)
+
+    return grid_fragment_cache.copy_keys(transform)
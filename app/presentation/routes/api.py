@@ -0,0 +1,215 @@
+"""Read-only JSON API (v1).
+
+Every list endpoint uses keyset pagination (``cursor`` / ``limit``) and
+sparse field selection (``fields=a,b``), and responds with
+``{"data": [...], "next_cursor": ...}``. Rows are projected straight into
+tuples, the same ones the timetable grid uses, and serialized with orjson.
+"""
+
+from starlette.requests import Request
+
+from app.domain.models import Course, Lecturer, Venue, Timetable, TimetableStatus
+from app.domain.models.timeslot import DayOfWeek
+from app.domain.services.auth import AuthService
+from app.infrastructure.security import PasswordHasherBusy, RateLimited
+from app.domain.services.timetable_service import GridEntry, TimetableService
+from app.infrastructure.http import (
+    PRIVATE_CACHE_CONTROL, ORJSONResponse,
+    make_etag, is_not_modified, cache_headers, not_modified_response,
+    encode_cursor, decode_cursor, parse_limit, parse_fields,
+)
+
+API_PREFIX = "/api/v1"
+
+TIMETABLE_COLUMNS = (
+    Timetable.id, Timetable.academic_session, Timetable.semester, Timetable.status,
+    Timetable.is_active, Timetable.parent_id, Timetable.created_at, Timetable.updated_at,
+)
+COURSE_COLUMNS = (
+    Course.id, Course.code, Course.title, Course.department, Course.level,
+    Course.semester, Course.credit_hours, Course.enrollment, Course.lecturer_id,
+)
+LECTURER_COLUMNS = (
+    Lecturer.id, Lecturer.name, Lecturer.email, Lecturer.department, Lecturer.max_hours_per_day,
+)
+VENUE_COLUMNS = (Venue.id, Venue.name, Venue.capacity, Venue.type)
+TIMESLOT_FIELDS = ("id", "day", "start_time", "end_time")
+
+
+def _error(status_code: int, message: str) -> ORJSONResponse:
+    return ORJSONResponse({"error": message}, status_code=status_code)
+
+
+def _rows(rows, fields) -> list:
+    """Project row tuples onto the selected fields."""
+    return [{f: getattr(row, f) for f in fields} for row in rows]
+
+
+def _int_filter(value, name: str):
+    """Parse an optional integer query filter."""
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+def _list_table(request: Request, columns, key_column, filters: dict) -> ORJSONResponse:
+    """One keyset page of a table projection, ordered by a unique key column."""
+    params = request.query_params
+    try:
+        fields = parse_fields(params.get("fields"), [c.key for c in columns])
+        limit = parse_limit(params.get("limit"))
+        after = decode_cursor(params.get("cursor"))
+    except ValueError as e:
+        return _error(400, str(e))
+
+    query = request.state.read_db.query(*columns)
+    for column, value in filters.items():
+        if value is not None:
+            query = query.filter(column == value)
+    if after is not None:
+        query = query.filter(key_column > after)
+    rows = query.order_by(key_column).limit(limit + 1).all()
+
+    next_cursor = encode_cursor(getattr(rows[limit - 1], key_column.key)) if len(rows) > limit else None
+    return ORJSONResponse({"data": _rows(rows[:limit], fields), "next_cursor": next_cursor})
+
+
+def api_routes(app):
+    """Register JSON API routes."""
+
+    @app.post(f"{API_PREFIX}/token")
+    async def api_token(request: Request):
+        """Exchange username/password for a bearer token."""
+        form = await request.form()
+        try:
+            user = await AuthService.authenticate_user_async(
+                request.state.async_db, form.get("username", ""), form.get("password", ""),
+                request.client.host if request.client else None
+            )
+        except RateLimited as e:
+            return ORJSONResponse({"error": "Too many login attempts, retry later"},
+                                  status_code=429, headers={"Retry-After": str(int(e.retry_after + 0.5))})
+        except PasswordHasherBusy:
+            return ORJSONResponse({"error": "Too many login attempts in progress, retry shortly"},
+                                  status_code=503, headers={"Retry-After": "1"})
+        if not user:
+            return _error(401, "Invalid username or password")
+        access_token, _ = AuthService(request.state.db).create_user_tokens(user)
+        return ORJSONResponse({"access_token": access_token, "token_type": "bearer"})
+
+    @app.get(f"{API_PREFIX}/timetables")
+    def api_timetables(request: Request, status: str = None, semester: str = None, academic_session: str = None):
+        """List timetables."""
+        try:
+            status_value = TimetableStatus(status) if status else None
+            semester_value = _int_filter(semester, "semester")
+        except ValueError as e:
+            return _error(400, str(e))
+        return _list_table(request, TIMETABLE_COLUMNS, Timetable.id, {
+            Timetable.status: status_value,
+            Timetable.semester: semester_value,
+            Timetable.academic_session: academic_session,
+        })
+
+    @app.get(f"{API_PREFIX}/timetables/{{timetable_id}}")
+    def api_timetable(request: Request, timetable_id: str):
+        """A single timetable."""
+        try:
+            fields = parse_fields(request.query_params.get("fields"), [c.key for c in TIMETABLE_COLUMNS])
+        except ValueError as e:
+            return _error(400, str(e))
+        row = request.state.read_db.query(*TIMETABLE_COLUMNS).filter(Timetable.id == timetable_id).first()
+        if row is None:
+            return _error(404, "Timetable not found")
+        return ORJSONResponse({"data": _rows([row], fields)[0]})
+
+    @app.get(f"{API_PREFIX}/timetables/{{timetable_id}}/entries")
+    def api_timetable_entries(request: Request, timetable_id: str, department: str = None, level: str = None,
+                              lecturer_id: str = None, venue_id: str = None, course_id: str = None):
+        """
+        Entries of a timetable as grid rows, one per block (timeslot_id is
+        the first slot, duration the number of slots), ordered by entry id.
+        """
+        db = request.state.read_db
+        params = request.query_params
+        try:
+            fields = parse_fields(params.get("fields"), GridEntry._fields)
+            limit = parse_limit(params.get("limit"))
+            after = decode_cursor(params.get("cursor"))
+            _int_filter(level, "level")
+        except ValueError as e:
+            return _error(400, str(e))
+
+        timetable = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+        if timetable is None:
+            return _error(404, "Timetable not found")
+
+        # Pages of a version never change, so clients can revalidate cheaply
+        etag = make_etag("api", timetable.id, timetable.updated_at, timetable.status.value,
+                         sorted(params.multi_items()))
+        headers = cache_headers(etag, timetable.updated_at, PRIVATE_CACHE_CONTROL, vary=None)
+        if is_not_modified(request, etag, timetable.updated_at):
+            return not_modified_response(headers)
+
+        filters = {
+            name: value for name, value in
+            (("lecturer_id", lecturer_id), ("venue_id", venue_id), ("course_id", course_id))
+            if value
+        }
+        if timetable.status == TimetableStatus.ARCHIVED:
+            # Archived entries live in the compacted archive blob
+            from app.domain.services.archive_service import ArchiveService
+            entries = sorted(
+                (e for e, _ in ArchiveService.load_entries(db, timetable.id, department, level, **filters)
+                 if after is None or e.id > after),
+                key=lambda e: e.id
+            )[:limit + 1]
+        else:
+            entries = TimetableService.query_grid_entries(
+                db, timetable.id, department, level, after=after, limit=limit + 1, **filters
+            )
+
+        next_cursor = encode_cursor(entries[limit - 1].id) if len(entries) > limit else None
+        return ORJSONResponse(
+            {"data": _rows(entries[:limit], fields), "next_cursor": next_cursor},
+            headers=headers
+        )
+
+    @app.get(f"{API_PREFIX}/courses")
+    def api_courses(request: Request, department: str = None, level: str = None,
+                    semester: str = None, lecturer_id: str = None):
+        """List courses, ordered by code."""
+        try:
+            filters = {
+                Course.department: department,
+                Course.level: _int_filter(level, "level"),
+                Course.semester: _int_filter(semester, "semester"),
+                Course.lecturer_id: lecturer_id,
+            }
+        except ValueError as e:
+            return _error(400, str(e))
+        return _list_table(request, COURSE_COLUMNS, Course.code, filters)
+
+    @app.get(f"{API_PREFIX}/lecturers")
+    def api_lecturers(request: Request, department: str = None):
+        """List lecturers."""
+        return _list_table(request, LECTURER_COLUMNS, Lecturer.id, {Lecturer.department: department})
+
+    @app.get(f"{API_PREFIX}/venues")
+    def api_venues(request: Request):
+        """List venues, ordered by name."""
+        return _list_table(request, VENUE_COLUMNS, Venue.name, {})
+
+    @app.get(f"{API_PREFIX}/timeslots")
+    def api_timeslots(request: Request):
+        """All timeslots (a small, fixed set, so not paginated)."""
+        try:
+            fields = parse_fields(request.query_params.get("fields"), TIMESLOT_FIELDS)
+        except ValueError as e:
+            return _error(400, str(e))
+        day_order = {d: i for i, d in enumerate(DayOfWeek)}
+        slots = sorted(TimetableService.get_slots(request.state.read_db), key=lambda s: (day_order[s.day], s.start_time))
+        return ORJSONResponse({"data": _rows(slots, fields), "next_cursor": None})
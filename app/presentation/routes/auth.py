@@ -8,17 +8,27 @@ from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
 from app.domain.services.auth import AuthService
+from app.infrastructure.security import PasswordHasherBusy, RateLimited
 from faststrap import (
     Container, Card, Input, Button, 
     Alert, Icon
 )
 
 
+# Messages for the ?error= codes login_submit redirects with
+LOGIN_ERRORS = {
+    "invalid": "Invalid username or password.",
+    "throttled": "Too many login attempts. Please wait a few minutes and try again.",
+    "busy": "The server is busy signing other users in. Please try again in a moment.",
+}
+
+
 def auth_routes(app):
     """Register authentication routes."""
     
     @app.get("/login")
     def login_page(request: Request):
+        error = LOGIN_ERRORS.get(request.query_params.get("error"))
         return Div(
             Container(
                 Card(
@@ -32,6 +42,8 @@ def auth_routes(app):
                         H4("Timetable Scheduler", cls="text-center fw-bold mb-1"),
                         P("Sign in to your account", cls="text-center text-muted small mb-4"),
                         
+                        Alert(error, variant="danger", cls="small py-2") if error else None,
+                        
                         # Back Home Button
                         A(
                             Icon("arrow-left", cls="me-2"),
@@ -80,7 +92,18 @@ def auth_routes(app):
         db = request.state.db
         auth_service = AuthService(db)
         
-        user = auth_service.authenticate_user(username, password)
+        # Throttled attempts are refused before bcrypt runs on the worker pool.
+        # Behind a trusted proxy (FORWARDED_ALLOW_IPS) the client address is
+        # the forwarded one, so limits stay per client.
+        client_ip = request.client.host if request.client else None
+        try:
+            user = await AuthService.authenticate_user_async(
+                request.state.async_db, username, password, client_ip
+            )
+        except RateLimited:
+            return RedirectResponse(url="/login?error=throttled", status_code=303)
+        except PasswordHasherBusy:
+            return RedirectResponse(url="/login?error=busy", status_code=303)
         
         if not user:
             # For simplicity, we redirect back to login (FastHTML/HTMX can do better, but keeping it simple)
@@ -100,7 +123,8 @@ def auth_routes(app):
         return resp
 
     @app.get("/logout")
-    def logout():
+    def logout(request: Request):
+        AuthService.forget_token(request.cookies.get("access_token"))
         resp = RedirectResponse(url="/login", status_code=303)
         resp.delete_cookie("access_token")
         return resp
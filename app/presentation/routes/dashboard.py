@@ -11,7 +11,7 @@ from app.presentation.components.layout import DashboardLayout
 from faststrap import (
     Row, Col, Card, Icon, Badge, Button
 )
-from sqlalchemy import func
+from sqlalchemy import func, select
 from app.domain.models import Course, Lecturer, Venue, Timetable
 from app.domain.services.auth import AuthService
 
@@ -21,23 +21,22 @@ def dashboard_routes(app):
     """Register dashboard routes."""
     
     @app.get("/dashboard")
-    def dashboard(request: Request):
-        token = request.cookies.get("access_token")
-        if not token:
-            return RedirectResponse(url="/login", status_code=303)
-            
-        db = request.state.db
-        user = AuthService.get_current_user_from_token(token, db)
+    async def dashboard(request: Request):
+        # AuthMiddleware has already verified the token and loaded the user
+        db = request.state.async_read_db
+        user = getattr(request.state, "user", None)
         
         if not user:
              return RedirectResponse(url="/login", status_code=303)
 
 
-        # Stats Real Data
-        courses_count = db.query(func.count(Course.id)).scalar()
-        lecturers_count = db.query(func.count(Lecturer.id)).scalar()
-        venues_count = db.query(func.count(Venue.id)).scalar()
-        timetables_count = db.query(func.count(Timetable.id)).scalar()
+        # Stats Real Data (all four counts in one round trip)
+        courses_count, lecturers_count, venues_count, timetables_count = (await db.execute(select(
+            select(func.count(Course.id)).scalar_subquery(),
+            select(func.count(Lecturer.id)).scalar_subquery(),
+            select(func.count(Venue.id)).scalar_subquery(),
+            select(func.count(Timetable.id)).scalar_subquery(),
+        ))).one()
 
         stats = [
             {"label": "Total Courses", "value": str(courses_count), "icon": "journal-bookmark-fill", "color": "primary"},
@@ -96,7 +95,7 @@ def dashboard_routes(app):
             ),
             
             # Alert Section - Dynamic based on real conflicts
-            *_build_dashboard_alerts(db),
+            *await db.run_sync(_build_dashboard_alerts),
             
             current_user=user,
             active_page="dashboard"
@@ -104,8 +103,7 @@ def dashboard_routes(app):
 
 def _build_dashboard_alerts(db):
     """Build dashboard alert section based on real conflicts."""
-    from app.domain.models import TimetableEntry, TimeSlot
-    from sqlalchemy import and_
+    from app.domain.models import TimetableEntry
     
     # Check for conflicts in the latest published timetable
     latest_timetable = db.query(Timetable).filter(
@@ -128,28 +126,28 @@ def _build_dashboard_alerts(db):
         ]
     
     # Check for venue conflicts (same venue, same time slot)
+    from app.domain.services.timetable_service import TimetableService
     conflicts = []
-    entries = db.query(TimetableEntry).filter(
-        TimetableEntry.timetable_id == latest_timetable.id,
-        TimetableEntry.venue_id.isnot(None)
-    ).all()
+    entries = [
+        e for e in TimetableService.query_grid_entries(db, latest_timetable.id)
+        if e.venue_id is not None
+    ]
     
-    # Group by venue and time slot
+    # Group by venue and every hour each block covers
+    placements, _ = TimetableService._place_entries(db, entries)
     venue_time_map = {}
-    for entry in entries:
-        key = (entry.venue_id, entry.timeslot_id, entry.timeslot.day.value)
+    for entry, day, start, end in placements:
+        key = (entry.venue_id, day.value, start, end)
         if key not in venue_time_map:
             venue_time_map[key] = []
         venue_time_map[key].append(entry)
     
     # Find conflicts
-    for key, entries_list in venue_time_map.items():
+    for (venue_id, day, start, end), entries_list in venue_time_map.items():
         if len(entries_list) > 1:
-            venue = entries_list[0].venue
-            time_slot = entries_list[0].timeslot
-            day = time_slot.day.value
-            courses = ", ".join([e.course.code for e in entries_list])
-            conflicts.append(f"Venue conflict: {venue.name} double-booked on {day} {time_slot.start_time.strftime('%H:%M')}-{time_slot.end_time.strftime('%H:%M')} ({courses})")
+            venue_name = entries_list[0].venue_name
+            courses = ", ".join([e.course_code for e in entries_list])
+            conflicts.append(f"Venue conflict: {venue_name} double-booked on {day} {start.strftime('%H:%M')}-{end.strftime('%H:%M')} ({courses})")
     
     # Check for unassigned venues
     unassigned_count = db.query(func.count(TimetableEntry.id)).filter(
@@ -23,7 +23,8 @@ def lecturers_routes(app):
                 l.name,
                 l.email,
                 Badge(l.department, "info"),
-                f"{l.max_hours_per_day} hrs"
+                f"{l.max_hours_per_day} hrs",
+                A(Icon("calendar3", cls="me-1"), "View", href=f"/timetable/lecturer/{l.id}", cls="small")
             ])
             # Note: Deleting by Name (col 0) might verify difficult if names are not unique.
             # Email is unique. Let's rely on Email?
@@ -73,7 +74,7 @@ def lecturers_routes(app):
             
             # Data Table
             DataTable(
-                columns=["Name", "Email", "Department", "Max Hours/Day"],
+                columns=["Name", "Email", "Department", "Max Hours/Day", "Timetable"],
                 rows=rows,
                 id_index=1, # Use Email as ID
                 edit_modal_id="editLecturerModal",
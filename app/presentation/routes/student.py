@@ -1,8 +1,16 @@
+from urllib.parse import urlencode
+
 from fasthtml.common import *
 from faststrap import *
-from app.domain.models import Course, Timetable, TimetableStatus
+from app.domain.models import Timetable
 from app.domain.services.timetable_service import TimetableService
-from app.presentation.components.timetable_view import TimetableGrid
+from app.domain.services.snapshot_service import SnapshotService
+from app.domain.services.search_service import CourseSearchService
+from app.domain.services.calendar_service import CalendarService, calendar_cache
+from app.infrastructure.http import (
+    PUBLISHED_CACHE_CONTROL, make_etag, is_not_modified, cache_headers, not_modified_response
+)
+from app.presentation.components.timetable_view import CachedTimetableGridAsync, TimetableGrid
 from app.presentation.routes.timetable import DashboardLayout # Re-use or custom layout? 
 # Use a custom Student Layout without Sidebar for cleaner look, or re-use DashboardNavbar?
 # Let's define a simple layout here or reuse LandingLayout style but with filtering.
@@ -63,11 +71,12 @@ def student_routes(app):
         )
 
     @app.get("/student/timetables")
-    def student_timetables_partial(request: Request, department: str = "All", level: str = "All", query: str = ""):
-        db = request.state.db
+    async def student_timetables_partial(request: Request, department: str = "All", level: str = "All", query: str = ""):
+        # The hottest page: every query goes through the async driver
+        db = request.state.async_read_db
         
         # Get Latest Published Timetable
-        timetable = db.query(Timetable).filter(Timetable.status == TimetableStatus.PUBLISHED).order_by(Timetable.created_at.desc()).first()
+        timetable = await SnapshotService.latest_published_async(db)
         
         if not timetable:
              return Div(
@@ -80,17 +89,45 @@ def student_routes(app):
                  cls="card shadow-sm border-0"
              )
 
+        # Conditional GET: the published version and filters identify the body;
+        # search results also depend on the course index version
+        query = query.strip()
+        etag = make_etag(timetable.id, timetable.updated_at, department, level, query,
+                         await CourseSearchService.version_async(db) if query else "",
+                         "partial" if "hx-request" in request.headers else "page")
+        headers = cache_headers(etag, timetable.updated_at, PUBLISHED_CACHE_CONTROL)
+        if is_not_modified(request, etag, timetable.updated_at):
+            return not_modified_response(headers)
+
         # Get Data for Grid
-        # We reuse the Service but filter by Published ID
-        data = TimetableService.get_timetable_grid(db, str(timetable.id), department, level)
+        # Published timetables are served from their pre-bucketed snapshots,
+        # and the rendered grid from the fragment cache
+        codes = None
+        if query:
+            # Course codes matched by the search index narrow the snapshot grid;
+            # search results are not fragment-cached to keep the cache for shared views
+            codes = {hit.code for hit in await CourseSearchService.search_async(db, query)}
+            data = TimetableService.filter_grid(await SnapshotService.get_grid_async(db, timetable, department, level), codes)
+            grid = TimetableGrid(data, readonly=True) if codes else Div(
+                Icon("search", style="font-size: 2rem;", cls="text-muted mb-2"),
+                P(f"No courses match \"{query}\".", cls="text-muted mb-0"),
+                cls="card shadow-sm border-0 text-center py-5"
+            )
+        else:
+            grid = await CachedTimetableGridAsync(
+                timetable, department, level,
+                lambda: SnapshotService.get_grid_async(db, timetable, department, level),
+                readonly=True
+            )
         
-        # Apply Text Search Filter (Service doesn't support text search on grid yet easily, so we rely on Dept/Level mostly)
-        # If query exists, we might filter 'entries' manually in the grid data, but TimetableGrid expects structured data.
-        # For prototype, we stick to Dept/Level filters as they are most effective for timetables.
+        # Calendar subscription for the current filters
+        calendar_params = {"department": department, "level": level}
+        if codes:
+            calendar_params["courses"] = ",".join(sorted(codes))
+        calendar_url = f"/student/calendar.ics?{urlencode(calendar_params)}"
         
         # Filter Options
-        depts = [r[0] for r in db.query(Course.department).distinct().order_by(Course.department).all()]
-        levels = [str(r[0]) for r in db.query(Course.level).distinct().order_by(Course.level).all()]
+        depts, levels = await SnapshotService.get_filters_async(db, timetable.id)
 
         return Div(
             # Filter Bar
@@ -127,33 +164,32 @@ def student_routes(app):
                             ),
                             cols=12, md=3, cls="mb-3 mb-md-0"
                         ),
-                        # Col(
-                        #      Div(
-                        #         Label("Search", cls="form-label small fw-bold text-muted"),
-                        #         Div(
-                        #             Icon("search", cls="position-absolute top-50 start-0 translate-middle-y ms-3 text-muted"),
-                        #             Input(
-                        #                 type="search", 
-                        #                 name="query", 
-                        #                 value=query,
-                        #                 placeholder="Search courses...", 
-                        #                 cls="form-control ps-5",
-                        #                 # hx_get="/student/timetables",
-                        #                 # hx_trigger="keyup changed delay:500ms",
-                        #                 # hx_target="#student-timetable-container",
-                        #                 # hx_include="[name='department'], [name='level']"
-                        #                 # Disabled text search for now as it requires complex grid filtering logic
-                        #                 disabled=True
-                        #             ),
-                        #             cls="position-relative"
-                        #         ),
-                        #     ),
-                        #     cols=12, md=5
-                        # ),
+                        Col(
+                             Div(
+                                Label("Search", cls="form-label small fw-bold text-muted"),
+                                Div(
+                                    Icon("search", cls="position-absolute top-50 start-0 translate-middle-y ms-3 text-muted"),
+                                    Input(
+                                        type="search", 
+                                        name="query", 
+                                        id="student-search",
+                                        value=query,
+                                        placeholder="Course code, title or lecturer...", 
+                                        cls="form-control ps-5",
+                                        hx_get="/student/timetables",
+                                        hx_trigger="keyup changed delay:400ms, search",
+                                        hx_target="#student-timetable-container",
+                                        hx_include="[name='department'], [name='level']"
+                                    ),
+                                    cls="position-relative"
+                                ),
+                            ),
+                            cols=12, md=5
+                        ),
                         cls="g-1",
                         cols=1,
                         cols_md=2,
-                        cols_lg=2,
+                        cols_lg=3,
                     ),
                     cls="p-1"
                 ),
@@ -167,16 +203,61 @@ def student_routes(app):
                      Badge("Active Timetable", bg="light", text="success", cls="border border-success me-2"),
                      Span(f"Session: {timetable.academic_session} | Semester {timetable.semester}", cls="text-muted small"),
                  ),
-                 A(
-                     Icon("file-pdf", cls="me-2"),
-                     "Download PDF",
-                     href=f"/timetable/export-pdf?timetable_id={timetable.id}&department={department}&level={level}",
-                     cls="btn btn-sm btn-primary",
-                     target="_blank"
+                 Div(
+                     A(
+                         Icon("calendar-plus", cls="me-2"),
+                         "Add to Calendar",
+                         href=calendar_url,
+                         cls="btn btn-sm btn-outline-primary me-2",
+                         title="Subscribe to this timetable in your calendar app"
+                     ),
+                     A(
+                         Icon("file-pdf", cls="me-2"),
+                         "Download PDF",
+                         href=f"/timetable/export-pdf?timetable_id={timetable.id}&department={department}&level={level}",
+                         cls="btn btn-sm btn-primary",
+                         target="_blank"
+                     ),
+                     cls="d-flex"
                  ),
                  cls="mb-3 d-flex justify-content-between align-items-center flex-wrap gap-3"
             ),
 
             # Grid
-            TimetableGrid(data, readonly=True)
+            grid
+        ), *[HttpHeader(k, v) for k, v in headers.items()]
+
+    @app.get("/student/calendar.ics")
+    def student_calendar(request: Request, department: str = "All", level: str = "All", courses: str = ""):
+        """
+        iCalendar feed of the published timetable for calendar subscriptions.
+        The published version comes from an in-process pointer and the feed
+        from a version-keyed cache, so revalidations and repeat polls are
+        answered without touching the database.
+        """
+        db = request.state.read_db
+        version = SnapshotService.published_version(db)
+        if version is None:
+            return Response("No timetable has been published yet.", status_code=404, media_type="text/plain")
+
+        course_codes = CalendarService.parse_courses(courses)
+        etag = make_etag("ics", version.timetable_id, version.updated_at, department, level, ",".join(course_codes))
+        headers = cache_headers(etag, version.updated_at, PUBLISHED_CACHE_CONTROL, vary=None)
+        if is_not_modified(request, etag, version.updated_at):
+            return not_modified_response(headers)
+
+        key = (version.timetable_id, version.updated_at, department, level, course_codes)
+        body = calendar_cache.get(key)
+        if body is None:
+            timetable = db.query(Timetable).filter(Timetable.id == version.timetable_id).first()
+            if timetable is None:
+                SnapshotService.invalidate_published_version()
+                return Response("No timetable has been published yet.", status_code=404, media_type="text/plain")
+            body = CalendarService.build_ics(db, timetable, department, level, course_codes).encode("utf-8")
+            calendar_cache.set(key, body)
+
+        return Response(
+            body,
+            media_type="text/calendar; charset=utf-8",
+            headers={"Content-Disposition": 'inline; filename="timetable.ics"', **headers}
         )
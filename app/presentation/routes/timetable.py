@@ -1,13 +1,23 @@
 from starlette.requests import Request
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, StreamingResponse
 from starlette.responses import Response # For HX-Redirect
+from starlette.concurrency import run_in_threadpool
 import time, json
 from fasthtml.common import *
-from faststrap import Card, Button, Icon, Row, Col, Badge, TCell, TRow, THead, TBody, Table, Modal
+from faststrap import Card, Button, Icon, Row, Col, Badge, TCell, TRow, THead, TBody, Table, Modal, Alert
 from app.presentation.components.layout import DashboardLayout
+from app.presentation.components.timetable_view import invalidate_timetable_fragments
+from app.infrastructure.http import (
+    PUBLISHED_CACHE_CONTROL, DRAFT_CACHE_CONTROL, PRIVATE_CACHE_CONTROL, ORJSONResponse,
+    make_etag, is_not_modified, cache_headers, not_modified_response
+)
 from app.domain.services.timetable_service import TimetableService
+from app.domain.services.snapshot_service import SnapshotService
 from app.domain.models import Course, TimetableEntry, Venue, TimeSlot
 
+# List page of each resource kind that has its own timetable view
+RESOURCE_LIST_URLS = {"lecturer": "/lecturers", "venue": "/venues"}
+
 def timetable_routes(app):
     """Register timetable routes."""
     
@@ -199,8 +209,11 @@ def timetable_routes(app):
                         Div(
                             A(Icon("eye"), cls="btn btn-sm btn-outline-primary me-1", href=f"/timetable/view?timetable_id={t.id}", title="View"),
                             Button(Icon("check-lg"), cls="btn btn-sm btn-outline-success me-1", 
-                                   disabled=(t.status == TimetableStatus.PUBLISHED),
-                                   hx_post=f"/timetable/publish/{t.id}", hx_swap="outerHTML", title="Publish") if t.status != TimetableStatus.PUBLISHED else "",
+                                   hx_post=f"/timetable/publish/{t.id}", hx_swap="outerHTML", title="Publish") if t.status == TimetableStatus.DRAFT else "",
+                            A(Icon("arrow-left-right"), cls="btn btn-sm btn-outline-info me-1",
+                              href=f"/timetable/diff?to_id={t.id}", title="Compare with previous version"),
+                            Button(Icon("files"), cls="btn btn-sm btn-outline-secondary me-1",
+                                   hx_post=f"/timetable/clone/{t.id}", hx_swap="none", title="Clone as Draft") if t.status != TimetableStatus.ARCHIVED else "",
                             Button(Icon("trash"), cls="btn btn-sm btn-outline-danger", 
                                    hx_delete=f"/timetable/delete/{t.id}", 
                                    hx_confirm="Are you sure you want to delete this timetable?",
@@ -259,8 +272,11 @@ def timetable_routes(app):
         
         # Run the generation algorithm
         # In a production app, this should be a background task (Celery/RQ)
-        # For now, we run it synchronously to keep things simple
-        success, timetable_id = TimetableService.generate_timetable(db, semester=semester, constraints=constraints)
+        # For now it runs within the request, on a worker thread so the event
+        # loop keeps serving (and a stopping worker drains it like any request)
+        success, timetable_id = await run_in_threadpool(
+            TimetableService.generate_timetable, db, semester=semester, constraints=constraints
+        )
         
         # Returns the "Processing" state which polls for completion
         return Div(
@@ -463,7 +479,10 @@ def timetable_routes(app):
             
         courses_query = db.query(Course).filter(Course.semester == semester)
         if query:
-            courses_query = courses_query.filter(Course.code.ilike(f"%{query}%") | Course.title.ilike(f"%{query}%"))
+            # Matched through the in-memory course index instead of an ILIKE scan
+            from app.domain.services.search_service import CourseSearchService
+            hits = CourseSearchService.search(db, query)
+            courses_query = courses_query.filter(Course.id.in_([h.id for h in hits]))
             
         courses = courses_query.order_by(Course.level, Course.code).limit(20).all()
         
@@ -638,10 +657,32 @@ def timetable_routes(app):
 
     @app.get("/timetable/view")
     def view_timetable(request: Request, department: str = "All", level: str = "All", timetable_id: str = None):
-        from app.presentation.components.timetable_view import TimetableGrid
+        from app.presentation.components.timetable_view import TimetableGrid, CachedTimetableGrid
+        # The editing view reads the primary: edits, publish and restore
+        # redirect straight here, and a lagging replica would hide them
         db = request.state.db
-        data = TimetableService.get_timetable_grid(db, timetable_id, department, level)
-        timetable = data.get('timetable')
+        user = request.state.user if hasattr(request.state, 'user') else None
+
+        # Conditional GET: this page is per-user, so only the browser may cache it
+        timetable = TimetableService.resolve_timetable(db, timetable_id)
+        headers = {}
+        if timetable:
+            etag = make_etag(timetable.id, timetable.updated_at, timetable.status.value, department, level,
+                             user.id if user else "", "partial" if "hx-request" in request.headers else "page")
+            headers = cache_headers(etag, timetable.updated_at, PRIVATE_CACHE_CONTROL)
+            if is_not_modified(request, etag, timetable.updated_at):
+                return not_modified_response(headers)
+
+        # The grid is only queried on a fragment cache miss
+        # Archived entries are compacted and can no longer be edited
+        if timetable:
+            grid = CachedTimetableGrid(
+                timetable, department, level,
+                lambda: TimetableService.get_timetable_grid(db, timetable.id, department, level),
+                readonly=timetable.status.value == "Archived"
+            )
+        else:
+            grid = TimetableGrid(TimetableService.get_timetable_grid(db, None, department, level))
         
         # Helper for course card (REMOVED - moved to component)
         
@@ -656,7 +697,7 @@ def timetable_routes(app):
             # Page Header
             Div(
                 Div(
-                    H2(f"Timetable ({'Draft' if not timetable or timetable.status.value == 'Draft' else 'Published'})", cls="fw-bold text-dark"),
+                    H2(f"Timetable ({timetable.status.value if timetable else 'Draft'})", cls="fw-bold text-dark"),
                     P(f"Session: {timetable.academic_session if timetable else '-'} | Semester: {timetable.semester if timetable else '-'}", cls="text-muted"),
                 ),
                 Div(
@@ -667,6 +708,12 @@ def timetable_routes(app):
                         cls="btn btn-success text-white me-2 shadow-sm"
                     ) if timetable and timetable.status.value == "Draft" else "",
 
+                    Button(
+                        Icon("files", cls="me-2"), "Clone as Draft",
+                        hx_post=f"/timetable/clone/{timetable.id}",
+                        hx_swap="none",
+                        cls="btn btn-outline-primary me-2 shadow-sm"
+                    ) if timetable and timetable.status.value != "Archived" else "",
                     
                     A(
                         Icon("file-pdf", cls="me-2"), "Export PDF",
@@ -741,7 +788,7 @@ def timetable_routes(app):
             ),
             
             # The Timetable Grid (Refactored)
-            TimetableGrid(data, readonly=False),
+            grid,
             
             # Edit Entry Modal
             Modal(
@@ -768,22 +815,194 @@ def timetable_routes(app):
             ),
             
             active_page="timetable",
-            current_user=request.state.user if hasattr(request.state, 'user') else None
-        )
+            current_user=user
+        ), *[HttpHeader(k, v) for k, v in headers.items()]
 
     @app.post("/timetable/publish/{timetable_id}")
     def publish_timetable(request: Request, timetable_id: str):
+        from app.domain.services.diff_service import TimetableDiffService
         db = request.state.db
-        success, msg = TimetableService.publish_timetable(db, timetable_id)
+        # Only the (department, level) groups that differ from the version
+        # being replaced are rebuilt; the rest is carried over from it
+        base, affected = TimetableDiffService.changes_from_base(db, timetable_id)
+        base_version = base.updated_at if base else None
+        success, msg = TimetableService.publish_timetable(db, timetable_id, base.id if base else None, affected)
+        invalidate_timetable_fragments(timetable_id)
+        SnapshotService.invalidate_published_version()
+        if success:
+            from app.domain.services.pdf_service import PDFService
+            if base is not None:
+                from app.domain.models import Timetable
+                from app.presentation.components.timetable_view import carry_timetable_fragments
+                target = db.query(Timetable).filter(Timetable.id == timetable_id).first()
+                carry_timetable_fragments(base.id, base_version, target, affected)
+                PDFService.carry_artifacts(db, base.id, base_version, target, affected)
+            PDFService.schedule_prerender(timetable_id)
         # We could return a toast or redirect
         # For simple UX, let's redirect to list
         from starlette.responses import Response
         return Response(status_code=200, headers={"HX-Redirect": "/timetables"})
 
+    @app.get("/timetable/diff")
+    def timetable_diff(request: Request, to_id: str, from_id: str = None):
+        """Show what changed between two timetable versions."""
+        from app.domain.models import Timetable
+        from app.domain.services.diff_service import TimetableDiffService
+        db = request.state.db
+
+        target = db.query(Timetable).filter(Timetable.id == to_id).first()
+        if not target:
+            return RedirectResponse(url="/timetables", status_code=303)
+        if not from_id:
+            from_id = TimetableDiffService.default_base_id(db, target)
+        base = db.query(Timetable).filter(Timetable.id == from_id).first() if from_id else None
+
+        def version_label(t):
+            return f"{t.academic_session} S{t.semester} {t.status.value} ({t.created_at.strftime('%Y-%m-%d %H:%M') if t.created_at else '-'})"
+
+        if not base:
+            body = P("There is no earlier version to compare this timetable with.", cls="text-muted mb-0")
+        else:
+            changes = TimetableDiffService.diff(db, base.id, target.id)
+
+            def ChangeList(title, items, color, render):
+                return Div(
+                    H6(f"{title} ({len(items)})", cls=f"fw-bold text-{color} mb-2"),
+                    Ul(*[Li(render(c), cls="small") for c in items], cls="mb-3 ps-3") if items
+                    else P("None", cls="small text-muted mb-3"),
+                )
+
+            body = Div(
+                ChangeList("Added", changes["added"], "success",
+                           lambda c: f"+ {c['course']}: {c['after']}"),
+                ChangeList("Removed", changes["removed"], "danger",
+                           lambda c: f"- {c['course']}: {c['before']}"),
+                ChangeList("Moved", changes["moved"], "primary",
+                           lambda c: f"~ {c['course']}: {c['before']} → {c['after']}"),
+            )
+
+        return DashboardLayout(
+            Div(
+                H2("Timetable Changes", cls="fw-bold text-dark"),
+                P(f"From: {version_label(base) if base else '-'}", cls="text-muted mb-0"),
+                P(f"To: {version_label(target)}", cls="text-muted"),
+                cls="mb-4"
+            ),
+            Card(Div(body, cls="p-3"), cls="shadow-sm border-0"),
+            active_page="timetables",
+            current_user=request.state.user if hasattr(request.state, 'user') else None
+        )
+
+    def resource_timetable(request: Request, kind: str, resource, timetable_id: str = None, as_json: bool = False):
+        """
+        Timetable of a single lecturer or venue. Only that resource's entries
+        are queried (indexed on course lecturer_id / entry venue_id), so the
+        cost follows the resource's own schedule, not the whole timetable.
+        """
+        from app.presentation.components.timetable_view import CachedTimetableGrid
+        db = request.state.read_db
+        user = request.state.user if hasattr(request.state, 'user') else None
+
+        list_url = RESOURCE_LIST_URLS.get(kind)
+        if list_url is None:
+            return ORJSONResponse({"error": "Unknown resource"}, status_code=404) if as_json else Response(status_code=404)
+
+        if resource is None:
+            if as_json:
+                return ORJSONResponse({"error": f"{kind.title()} not found"}, status_code=404)
+            return RedirectResponse(url=list_url, status_code=303)
+
+        filters = {f"{kind}_id": resource.id}
+        timetable = TimetableService.resolve_timetable(db, timetable_id)
+        headers = {}
+        if timetable:
+            variant = "json" if as_json else ("partial" if "hx-request" in request.headers else "page")
+            etag = make_etag(kind, resource.id, resource.name, timetable.id, timetable.updated_at,
+                             timetable.status.value, variant, "" if as_json else (user.id if user else ""))
+            headers = cache_headers(etag, timetable.updated_at, PRIVATE_CACHE_CONTROL)
+            if is_not_modified(request, etag, timetable.updated_at):
+                return not_modified_response(headers)
+
+        if as_json:
+            return ORJSONResponse({
+                kind: {"id": resource.id, "name": resource.name},
+                "timetable": {
+                    "id": timetable.id,
+                    "academic_session": timetable.academic_session,
+                    "semester": timetable.semester,
+                    "status": timetable.status.value,
+                } if timetable else None,
+                "sessions": TimetableService.get_sessions(db, timetable.id, **filters) if timetable else [],
+            }, headers=headers)
+
+        return DashboardLayout(
+            Div(
+                Div(
+                    H2(resource.name, cls="fw-bold text-dark"),
+                    P(f"{kind.title()} timetable | Session: {timetable.academic_session if timetable else '-'} | "
+                      f"Semester: {timetable.semester if timetable else '-'} | "
+                      f"{timetable.status.value if timetable else 'No timetable'}", cls="text-muted"),
+                ),
+                A(
+                    Icon("filetype-json", cls="me-2"), "JSON",
+                    href=f"/timetable/{kind}/{resource.id}/json?timetable_id={timetable.id if timetable else ''}",
+                    cls="btn btn-outline-secondary shadow-sm",
+                    target="_blank"
+                ) if timetable else "",
+                cls="d-flex justify-content-between align-items-center mb-4 w-100 flex-wrap"
+            ),
+            CachedTimetableGrid(
+                timetable, "All", "All",
+                lambda: TimetableService.get_timetable_grid(db, timetable.id, **filters),
+                readonly=True, scope=(kind, resource.id)
+            ) if timetable else P("No timetable has been generated yet.", cls="text-muted"),
+            active_page=f"{kind}s",
+            current_user=user
+        ), *[HttpHeader(k, v) for k, v in headers.items()]
+
+    @app.get("/timetable/lecturer/{lecturer_id}")
+    def lecturer_timetable(request: Request, lecturer_id: str, timetable_id: str = None):
+        """Timetable of one lecturer's courses."""
+        from app.domain.models import Lecturer
+        lecturer = request.state.read_db.query(Lecturer).filter(Lecturer.id == lecturer_id).first()
+        return resource_timetable(request, "lecturer", lecturer, timetable_id)
+
+    @app.get("/timetable/lecturer/{lecturer_id}/json")
+    def lecturer_timetable_json(request: Request, lecturer_id: str, timetable_id: str = None):
+        """One lecturer's sessions as JSON."""
+        from app.domain.models import Lecturer
+        lecturer = request.state.read_db.query(Lecturer).filter(Lecturer.id == lecturer_id).first()
+        return resource_timetable(request, "lecturer", lecturer, timetable_id, as_json=True)
+
+    @app.get("/timetable/venue/{venue_id}")
+    def venue_timetable(request: Request, venue_id: str, timetable_id: str = None):
+        """Timetable of one venue's bookings."""
+        venue = request.state.read_db.query(Venue).filter(Venue.id == venue_id).first()
+        return resource_timetable(request, "venue", venue, timetable_id)
+
+    @app.get("/timetable/venue/{venue_id}/json")
+    def venue_timetable_json(request: Request, venue_id: str, timetable_id: str = None):
+        """One venue's bookings as JSON."""
+        venue = request.state.read_db.query(Venue).filter(Venue.id == venue_id).first()
+        return resource_timetable(request, "venue", venue, timetable_id, as_json=True)
+
+    @app.post("/timetable/clone/{timetable_id}")
+    def clone_timetable(request: Request, timetable_id: str):
+        """Copy a timetable into a new draft and open it for editing."""
+        db = request.state.db
+        success, result = TimetableService.clone_timetable(db, timetable_id)
+        if not success:
+            return Response(status_code=200, headers={"HX-Redirect": "/timetables"})
+        return Response(status_code=200, headers={"HX-Redirect": f"/timetable/view?timetable_id={result}"})
+
     @app.delete("/timetable/delete/{timetable_id}")
     def delete_timetable(request: Request, timetable_id: str):
         db = request.state.db
         TimetableService.delete_timetable(db, timetable_id)
+        invalidate_timetable_fragments(timetable_id)
+        SnapshotService.invalidate_published_version()
+        from app.domain.services.pdf_service import PDFService
+        PDFService.discard_artifacts(timetable_id)
         return "" # Remove row
 
     @app.get("/timetable/entry/{entry_id}")
@@ -813,11 +1032,12 @@ def timetable_routes(app):
             ),
             Form(
                 Div(
-                    P(f"Course: {entry.course.title}", cls="text-muted mb-3"),
+                    P(f"Course: {entry.course.title}", cls="text-muted mb-1"),
+                    P(f"Block length: {entry.duration or 1} hour(s)", cls="small text-muted mb-3"),
                     
-                    # TimeSlot Select
+                    # TimeSlot Select (start of the block)
                     Div(
-                         Label("Time Slot", cls="form-label fw-bold"),
+                         Label("Start Time Slot", cls="form-label fw-bold"),
                          Select(
                              *[Option(f"{ts.day.value} {ts.start_time.strftime('%H:%M')}-{ts.end_time.strftime('%H:%M')}", 
                                       value=ts.id, 
@@ -863,6 +1083,8 @@ def timetable_routes(app):
         """Handle entry update."""
         form = await request.form()
         db = request.state.db
+        entry = TimetableService.get_entry(db, entry_id)
+        old_version = entry.timetable.updated_at if entry else None
         
         success, message = TimetableService.update_entry(
             db, 
@@ -872,6 +1094,15 @@ def timetable_routes(app):
         )
         
         if success:
+            # Grids and PDFs that do not show the moved course stay valid
+            from app.domain.services.pdf_service import PDFService
+            from app.presentation.components.timetable_view import carry_timetable_fragments
+            timetable = entry.timetable
+            affected = {(entry.course.department, entry.course.level)}
+            carry_timetable_fragments(timetable.id, old_version, timetable, affected)
+            invalidate_timetable_fragments(timetable.id, keep_version=timetable.updated_at)
+            PDFService.carry_artifacts(db, timetable.id, old_version, timetable, affected)
+            SnapshotService.invalidate_published_version()
             # Refresh the grid view
             # Using HTMX to redirect or refresh is tricky from modal.
             # Best: Return a script to close modal and refresh page OR simply redirect.
@@ -885,7 +1116,10 @@ def timetable_routes(app):
     def restore_timetable(request: Request):
         """Unlock all entries (Restore)."""
         db = request.state.db
-        TimetableService.restore_timetable(db)
+        # Lock icons change on every timetable that had locked entries
+        for timetable_id in TimetableService.restore_timetable(db):
+            invalidate_timetable_fragments(timetable_id)
+        SnapshotService.invalidate_published_version()
         from fasthtml.common import Response
         return Response(headers={"HX-Refresh": "true"})
 
@@ -941,18 +1175,23 @@ def timetable_routes(app):
     @app.get("/timetable/export-pdf")
     def export_timetable_pdf(request: Request, timetable_id: str = None, department: str = "All", level: str = "All"):
         """Export timetable as PDF."""
+        from app.domain.models import TimetableStatus
         from app.domain.services.pdf_service import PDFService
         
-        db = request.state.db
+        db = request.state.read_db
         
         try:
-            # Generate PDF
-            pdf_bytes = PDFService.generate_timetable_pdf(db, timetable_id, department, level)
-            
-            # Get timetable for filename
-            data = TimetableService.get_timetable_grid(db, timetable_id, department, level)
-            timetable = data.get('timetable')
-            
+            timetable = TimetableService.resolve_timetable(db, timetable_id)
+            if not timetable:
+                raise ValueError("Timetable not found")
+
+            # Conditional GET: skip rendering if the client has this version
+            etag = make_etag("pdf", timetable.id, timetable.updated_at, department, level)
+            policy = PUBLISHED_CACHE_CONTROL if timetable.status == TimetableStatus.PUBLISHED else DRAFT_CACHE_CONTROL
+            headers = cache_headers(etag, timetable.updated_at, policy, vary=None)
+            if is_not_modified(request, etag, timetable.updated_at):
+                return not_modified_response(headers)
+
             # Create filename
             filename = f"timetable_{timetable.academic_session.replace('/', '_')}_S{timetable.semester}"
             if department != "All":
@@ -961,12 +1200,33 @@ def timetable_routes(app):
                 filename += f"_L{level}"
             filename += ".pdf"
             
-            # Return PDF response
-            return Response(
-                content=pdf_bytes,
+            # Published versions are rendered once into the artifact store and
+            # sent from disk; drafts change too often to be worth storing, so
+            # they are rendered into a spooled buffer and streamed out
+            if timetable.status == TimetableStatus.PUBLISHED:
+                # Opened here, inside the try: a pruned file is re-rendered
+                # instead of failing once the response has started
+                from app.domain.services.pdf_service import iter_file_chunks
+                pdf = PDFService.open_pdf(db, timetable, department, level)
+                pdf.seek(0, 2)
+                size = pdf.tell()
+                pdf.seek(0)
+                return StreamingResponse(
+                    iter_file_chunks(pdf),
+                    media_type="application/pdf",
+                    headers={
+                        "Content-Disposition": f'attachment; filename="{filename}"',
+                        "Content-Length": str(size),
+                        **headers
+                    }
+                )
+            
+            return StreamingResponse(
+                PDFService.stream_timetable_pdf(db, timetable.id, department, level),
                 media_type="application/pdf",
                 headers={
-                    "Content-Disposition": f'attachment; filename="{filename}"'
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                    **headers
                 }
             )
         except Exception as e:
@@ -974,4 +1234,4 @@ def timetable_routes(app):
             return Div(
                 Alert(f"Error generating PDF: {str(e)}", variant="danger"),
                 cls="p-4"
-            )
\ No newline at end of file
+            )
@@ -28,7 +28,8 @@ def venues_routes(app):
             rows.append([
                 v.name,
                 f"{v.capacity} seats",
-                Badge(v.type.value.replace("_", " ").title(), badge_color)
+                Badge(v.type.value.replace("_", " ").title(), badge_color),
+                A(Icon("calendar3", cls="me-1"), "View", href=f"/timetable/venue/{v.id}", cls="small")
             ])
             # Use Name as ID (index 0)
         
@@ -72,7 +73,7 @@ def venues_routes(app):
             
             # Data Table
             DataTable(
-                columns=["Venue Name", "Capacity", "Type"],
+                columns=["Venue Name", "Capacity", "Type", "Timetable"],
                 rows=rows,
                 id_index=0, # Use Name as ID
                 edit_modal_id="editVenueModal",
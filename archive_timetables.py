@@ -0,0 +1,46 @@
+"""Archive superseded timetable versions.
+
+Marks drafts and published versions replaced by the active published
+timetable as archived, and compacts their entries out of the
+timetable_entries table.
+
+Usage:
+    python archive_timetables.py            # Archive superseded timetables
+    python archive_timetables.py --dry-run  # Only list what would be archived
+"""
+
+import argparse
+
+from app.infrastructure.database import get_db
+from app.domain.services.archive_service import ArchiveService
+
+
+def main():
+    """Run the archival job."""
+    parser = argparse.ArgumentParser(description="Archive superseded timetables")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List superseded timetables without archiving them"
+    )
+    args = parser.parse_args()
+
+    with get_db() as db:
+        superseded = ArchiveService.find_superseded(db)
+        if not superseded:
+            print("[INFO] Nothing to archive.")
+            return
+
+        for t in superseded:
+            print(f"  [-] {t.academic_session} S{t.semester} {t.status.value} ({t.created_at:%Y-%m-%d %H:%M})")
+
+        if args.dry_run:
+            print(f"[INFO] {len(superseded)} timetable(s) would be archived.")
+            return
+
+        count = ArchiveService.archive_superseded(db)
+        print(f"[SUCCESS] Archived {count} timetable(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Gunicorn configuration for production.
+
+Runs the app in several uvicorn worker processes:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master (preload) and forked into the
+workers. Each worker drops the database connections it inherited, is
+recycled after WEB_MAX_REQUESTS requests, and on shutdown finishes its
+in-flight requests (generations included) before stopping its worker pools.
+"""
+
+import multiprocessing
+
+from app.config import get_settings
+
+settings = get_settings()
+
+bind = f"{settings.host}:{settings.port}"
+workers = settings.web_workers or multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once in the master; workers share its memory copy-on-write
+preload_app = True
+
+# Recycle workers to bound memory growth; jitter avoids recycling all at once
+max_requests = settings.web_max_requests
+max_requests_jitter = settings.web_max_requests_jitter
+
+# Stopping workers get this long to finish in-flight requests, generations
+# included
+graceful_timeout = settings.web_graceful_timeout
+
+# A worker whose event loop has not checked in with the master for this long
+# is killed and restarted. Sync handlers (generations, PDF exports) run in a
+# thread pool and keep the loop free, so this only has to cover the longest
+# the loop itself may be blocked.
+timeout = settings.web_worker_timeout
+keepalive = 5
+
+# Behind a reverse proxy, take the client address from X-Forwarded-For, but
+# only when the request comes from one of these proxies. Login rate limits
+# key on that address; without it every client shares the proxy's IP.
+forwarded_allow_ips = settings.forwarded_allow_ips
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections."""
+    from app.infrastructure.database import dispose_engines
+    dispose_engines()
+
+
+def worker_exit(server, worker):
+    """Stop the worker's background pools once its requests have drained."""
+    from app.domain.services.pdf_service import shutdown_prerender_pool
+    from app.infrastructure.security import shutdown_password_pool
+
+    # Let queued PDF pre-renders finish so published versions are not left unrendered
+    shutdown_prerender_pool(wait=True)
+    shutdown_password_pool()
@@ -1,7 +1,7 @@
 """Initialize database tables.
 
-This script creates all database tables in PostgreSQL.
-Run this before seeding data.
+This script brings the database schema up to date by applying all
+pending migrations (see migrate.py). Run this before seeding data.
 """
 
 from app.infrastructure.database import init_db
@@ -12,21 +12,17 @@ settings = get_settings()
 def main():
     """Initialize database tables."""
     print(f"[DB] Connecting to: {settings.db_url}")
-    print("[DB] Creating tables...")
+    print("[DB] Applying migrations...")
     
     try:
-        init_db()
-        print("[SUCCESS] All tables created successfully!")
-        print("[INFO] Tables created:")
-        print("  - users")
-        print("  - courses")
-        print("  - lecturers")
-        print("  - venues")
-        print("  - timeslots")
-        print("  - timetable_entries")
-        print("\n[NEXT] Run 'python seed_db.py' to populate with sample data")
+        applied = init_db()
+        if applied:
+            print(f"[SUCCESS] Applied {len(applied)} migration(s); schema is up to date!")
+        else:
+            print("[SUCCESS] Schema already up to date!")
+        print("\n[NEXT] Run 'python seed_database.py' to populate with sample data")
     except Exception as e:
-        print(f"[ERROR] Failed to create tables: {e}")
+        print(f"[ERROR] Failed to migrate database: {e}")
         raise
 
 
@@ -2,17 +2,35 @@
 
 This module initializes the FastHTML application, sets up routes,
 and configures the server.
+
+Importing this module only builds the app: it never touches the database.
+Create the schema explicitly first (python init_db.py).
 """
 
+import time
+
+# Startup phases (milliseconds), reported by /metrics
+_boot_mark = time.perf_counter()
+startup_timings = {}
+
+
+def _record_startup(phase: str) -> None:
+    """Record the time spent since the previous startup phase."""
+    global _boot_mark
+    now = time.perf_counter()
+    startup_timings[phase] = round((now - _boot_mark) * 1000, 1)
+    _boot_mark = now
+
+
 from fasthtml.common import *
 from starlette.middleware import Middleware
 from starlette.staticfiles import StaticFiles
 
+from app.infrastructure.database import require_async_support
 from app.infrastructure.database.middleware import DBSessionMiddleware
 from app.infrastructure.security.middleware import AuthMiddleware
 from faststrap import add_bootstrap, mount_assets
 from app.config import get_settings
-from app.infrastructure.database import init_db
 from app.presentation.components.shared import TIMETABLE_THEME, setup_timetable_defaults
 from app.presentation.routes.auth import auth_routes
 from app.presentation.routes.dashboard import dashboard_routes
@@ -21,9 +39,14 @@ from app.presentation.routes.lecturers import lecturers_routes
 from app.presentation.routes.venues import venues_routes
 from app.presentation.routes.timetable import timetable_routes
 
+_record_startup("imports")
+
 # Get settings
 settings = get_settings()
 
+# Request handlers (and authentication) read through the async engine
+require_async_support()
+
 # Create FastHTML app with session support and DB/Auth middleware
 app = FastHTML(
     secret_key=settings.secret_key,
@@ -43,8 +66,7 @@ setup_timetable_defaults()
 # Mount static files directory
 mount_assets(app, "app/presentation/assets", url_path="/assets")
 
-# Initialize database
-init_db()
+_record_startup("app")
 
 from app.presentation.routes.landing import landing_routes
 
@@ -63,10 +85,14 @@ def create_app():
     from app.presentation.routes.student import student_routes
     student_routes(app)
     
+    from app.presentation.routes.api import api_routes
+    api_routes(app)
+    
     return app
 
 # Call create_app to register routes immediately
 create_app()
+_record_startup("routes")
 
 # Temporary home route removed (replaced by landing_routes)
 
@@ -77,9 +103,27 @@ def health_check():
     return {"status": "healthy", "service": "timetable-system"}
 
 
+@app.get("/metrics")
+def metrics():
+    """Runtime counters (worker pools, caches, login limits) for monitoring. Requires login."""
+    from app.infrastructure.security import password_pool_stats, get_login_limiter
+    from app.presentation.components.timetable_view import grid_fragment_cache
+    from app.domain.services.calendar_service import calendar_cache
+    from app.infrastructure.database import read_router
+    return {
+        "password_pool": password_pool_stats(),
+        "login_limiter": get_login_limiter().stats(),
+        "fragment_cache": grid_fragment_cache.stats(),
+        "calendar_cache": calendar_cache.stats(),
+        "read_replicas": read_router.status(),
+        "startup_ms": {**startup_timings, "total": round(sum(startup_timings.values()), 1)},
+    }
+
+
 # Run the application
 if __name__ == "__main__":
     print(f"[*] Starting {settings.app_name}")
     print(f"[DB] Database: {settings.db_url}")
     print(f"[WEB] Server: http://{settings.host}:{settings.port}")
-    serve(port=settings.port, host=settings.host)
+    print(f"[BOOT] Startup (ms): {startup_timings}")
+    serve(port=settings.port, host=settings.host, forwarded_allow_ips=settings.forwarded_allow_ips)
@@ -0,0 +1,48 @@
+"""Database schema migration tool.
+
+Applies the versioned migrations in app/infrastructure/database/migrations.
+
+Usage:
+    python migrate.py upgrade [VERSION]   # apply pending migrations (up to VERSION)
+    python migrate.py current             # show the applied version
+    python migrate.py history             # list migrations and their status
+"""
+
+import argparse
+import sys
+
+from app.config import get_settings
+from app.infrastructure.database import engine
+from app.infrastructure.database.migrations import Migrator, discover
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade = commands.add_parser("upgrade", help="Apply pending migrations")
+    upgrade.add_argument("version", nargs="?", type=int, help="Stop after this version")
+    commands.add_parser("current", help="Show the applied version")
+    commands.add_parser("history", help="List migrations and their status")
+    args = parser.parse_args(argv)
+
+    migrator = Migrator(engine)
+    print(f"[DB] Database: {get_settings().db_url}")
+
+    if args.command == "upgrade":
+        applied = migrator.upgrade(args.version)
+        current = migrator.current()
+        print(f"[SUCCESS] Applied {len(applied)} migration(s); now at "
+              f"{'none' if current is None else f'{current:04d}'}")
+    elif args.command == "current":
+        current = migrator.current()
+        print(f"[INFO] Current version: {'none' if current is None else f'{current:04d}'}")
+    else:
+        applied = set(migrator.applied())
+        for migration in discover():
+            status = "applied" if migration.version in applied else "pending"
+            print(f"  {migration.version:04d}  [{status:7}]  {migration.description}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,7 @@ Usage:
     python reset_database.py
 """
 
-from app.infrastructure.database import get_db, init_db
-from app.infrastructure.database.connection import engine
-from app.domain.models.base import Base
+from app.infrastructure.database import get_db, init_db, drop_db
 from app.domain.models import (
     User, Course, Lecturer, Venue, TimeSlot, Timetable, TimetableEntry
 )
@@ -43,10 +41,10 @@ def confirm_action(message):
 
 
 def reset_all_tables():
-    """Drop and recreate all tables."""
+    """Drop all tables and rebuild the schema through the migrations."""
     print("\n[*] Resetting ALL tables...")
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    drop_db()
+    init_db()
     print("[SUCCESS] All tables reset successfully!")
 
 
@@ -0,0 +1,16 @@
+"""Shared test setup.
+
+Settings are read from the environment when app modules are imported, so
+test values are provided here before any test module imports the app.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-0123456789abcdefghijklmnop")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-0123456789abcdefghijkl")
+os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault(
+    "DATABASE_URL_DEV",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'timetable_test.db')}",
+)
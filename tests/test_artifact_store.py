@@ -0,0 +1,32 @@
+"""Version pruning in the on-disk artifact store."""
+
+from app.infrastructure.storage import ArtifactStore
+
+OLD = "2026-01-01T08:00:00"
+NEW = "2026-01-02T08:00:00"
+
+
+def test_writing_a_version_drops_older_versions(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("pdf", "t1", OLD, "All|All", b"old")
+    store.put("pdf", "t1", NEW, "All|All", b"new")
+
+    assert store.get("pdf", "t1", OLD, "All|All") is None
+    assert store.get("pdf", "t1", NEW, "All|All").read_bytes() == b"new"
+
+
+def test_late_write_of_an_older_version_keeps_the_newer_one(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("pdf", "t1", NEW, "All|All", b"new")
+    store.put("pdf", "t1", OLD, "All|All", b"old")
+
+    assert store.get("pdf", "t1", NEW, "All|All").read_bytes() == b"new"
+
+
+def test_carry_keeps_newer_versions_of_the_target(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("pdf", "t1", OLD, "CS|100", b"cs")
+    store.put("pdf", "t2", NEW, "All|All", b"current")
+
+    assert store.carry("pdf", "t1", OLD, "t2", OLD, ["CS|100"]) == 1
+    assert store.get("pdf", "t2", NEW, "All|All").read_bytes() == b"current"
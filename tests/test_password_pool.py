@@ -0,0 +1,45 @@
+"""Queue accounting of the bounded bcrypt pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.infrastructure.security.password import PasswordHasherBusy, _PasswordPool
+
+
+def test_cancelling_a_queued_check_frees_its_slot():
+    pool = _PasswordPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        while pool.stats()["active"] == 0:
+            await asyncio.sleep(0.01)
+
+        queued = asyncio.ensure_future(pool.run(lambda: "never runs"))
+        await asyncio.sleep(0)
+        assert pool.stats()["queued"] == 1
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(lambda: None)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert pool.stats()["queued"] == 0
+
+        # The freed slot is usable again
+        follow_up = asyncio.ensure_future(pool.run(lambda: "ran"))
+        await asyncio.sleep(0)
+        release.set()
+        assert await running is True
+        assert await follow_up == "ran"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert (stats["queued"], stats["active"], stats["completed"]) == (0, 0, 2)
@@ -0,0 +1,143 @@
+"""Query plans of the hot timetable_entries lookups on SQLite.
+
+The grid, conflict-check and per-course/per-venue queries must be served by
+the composite timetable_entries indexes; a full scan of the table would make
+them grow with every historical timetable instead of the one being read.
+"""
+
+from datetime import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models import (
+    Course, DayOfWeek, Lecturer, TimeSlot, Timetable, TimetableEntry, Venue,
+)
+from app.domain.services.timetable_service import (
+    TimetableService, invalidate_slot_cache,
+)
+from app.infrastructure.database.migrations import Migrator
+
+# Composite indexes leading with timetable_id
+TIMETABLE_INDEXES = (
+    "ix_timetable_entries_timetable_slot_venue",
+    "ix_timetable_entries_timetable_course",
+    "ix_timetable_entries_timetable_venue",
+)
+
+
+@pytest.fixture()
+def db(tmp_path):
+    """A session on a migrated SQLite file holding one small timetable."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Migrator(engine).upgrade()
+    session = sessionmaker(bind=engine, autoflush=False)()
+
+    lecturer = Lecturer(
+        name="Ada Obi", email="ada@example.edu", department="Computer Science"
+    )
+    venue = Venue(name="LT1", capacity=200)
+    slots = [
+        TimeSlot(day=DayOfWeek.MONDAY, start_time=time(hour), end_time=time(hour + 1))
+        for hour in range(8, 12)
+    ]
+    course = Course(code="CSC101", title="Intro", level=100, credit_hours=2,
+                    department="Computer Science", semester=1, lecturer=lecturer)
+    timetable = Timetable(academic_session="2025/2026", semester=1)
+    session.add_all([lecturer, venue, course, timetable, *slots])
+    session.flush()
+    session.add(TimetableEntry(timetable_id=timetable.id, course_id=course.id,
+                               timeslot_id=slots[0].id, venue_id=venue.id, duration=1))
+    session.commit()
+    invalidate_slot_cache()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+    invalidate_slot_cache()
+
+
+def entry_query_plans(db, action):
+    """Run `action` and return the EXPLAIN QUERY PLAN of each statement it
+    issued against timetable_entries, as one string per statement."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        is_select = statement.lstrip().upper().startswith("SELECT")
+        if is_select and "FROM timetable_entries" in statement:
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    raw = engine.raw_connection()
+    try:
+        for statement, parameters in statements:
+            cursor = raw.cursor()
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            rows = cursor.fetchall()
+            plans.append("\n".join(row[-1] for row in rows))
+    finally:
+        raw.close()
+    assert plans, "no timetable_entries query was issued"
+    return plans
+
+
+def assert_uses_index(plan: str, *indexes: str):
+    searches = [f"USING INDEX {index} (timetable_id=?" for index in indexes]
+    assert any(search in plan for search in searches), plan
+    assert "SCAN timetable_entries" not in plan, plan
+
+
+def test_grid_load_uses_timetable_index(db):
+    # Any of the composite indexes serves an equality on timetable_id alone
+    timetable = db.query(Timetable).one()
+    plans = entry_query_plans(
+        db, lambda: TimetableService.query_grid_entries(db, timetable.id)
+    )
+    for plan in plans:
+        assert_uses_index(plan, *TIMETABLE_INDEXES)
+
+
+def test_slot_venue_conflict_check_uses_composite_index(db):
+    entry = db.query(TimetableEntry).one()
+    other_slot = db.query(TimeSlot).filter(TimeSlot.id != entry.timeslot_id).first()
+    plans = entry_query_plans(
+        db,
+        lambda: TimetableService.update_entry(
+            db, entry.id, other_slot.id, entry.venue_id
+        ),
+    )
+    conflict_plans = [plan for plan in plans if "timeslot_id" in plan]
+    assert conflict_plans, plans
+    for plan in conflict_plans:
+        assert_uses_index(plan, "ix_timetable_entries_timetable_slot_venue")
+
+
+def test_per_course_lookup_uses_course_index(db):
+    entry = db.query(TimetableEntry).one()
+    plans = entry_query_plans(db, lambda: db.query(TimetableEntry).filter(
+        TimetableEntry.timetable_id == entry.timetable_id,
+        TimetableEntry.course_id == entry.course_id,
+    ).all())
+    for plan in plans:
+        assert_uses_index(plan, "ix_timetable_entries_timetable_course")
+
+
+def test_per_venue_lookup_uses_venue_index(db):
+    entry = db.query(TimetableEntry).one()
+    plans = entry_query_plans(
+        db,
+        lambda: TimetableService.query_grid_entries(
+            db, entry.timetable_id, venue_id=entry.venue_id
+        ),
+    )
+    for plan in plans:
+        assert_uses_index(plan, "ix_timetable_entries_timetable_venue")